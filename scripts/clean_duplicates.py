@@ -14,13 +14,13 @@ from loguru import logger
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.database.database import DatabaseManager
+from src.database.database import get_db_manager
 from src.config.config import settings
 
 def clean_duplicate_students():
     """Clean duplicate students based on name and birth_date."""
     try:
-        db = DatabaseManager()
+        db = get_db_manager()
         
         # Get all students
         result = db.supabase.table('students').select('*').execute()
@@ -62,7 +62,7 @@ def clean_duplicate_students():
 def clean_duplicate_instagram_posts():
     """Clean duplicate Instagram posts based on post_date and main_hashtag."""
     try:
-        db = DatabaseManager()
+        db = get_db_manager()
         
         # Get all Instagram posts
         result = db.supabase.table('instagram_posts').select('*').execute()
@@ -104,7 +104,7 @@ def clean_duplicate_instagram_posts():
 def clean_duplicate_analytics():
     """Clean duplicate analytics based on metric_name and date."""
     try:
-        db = DatabaseManager()
+        db = get_db_manager()
         
         # Get all analytics
         result = db.supabase.table('analytics').select('*').execute()
@@ -15,7 +15,7 @@ from datetime import datetime
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.database import DatabaseManager
+from src.database import get_db_manager
 from src.analytics import AnalyticsEngine
 from src.config import settings
 from loguru import logger
@@ -26,7 +26,7 @@ def test_analytics_insertion():
         logger.info("🧪 Testing analytics insertion...")
         
         # Initialize components
-        db = DatabaseManager()
+        db = get_db_manager()
         analytics_engine = AnalyticsEngine()
         
         # Test connection
@@ -140,7 +140,7 @@ def test_simple_analytics():
     try:
         logger.info("🧪 Testing simple analytics insertion...")
         
-        db = DatabaseManager()
+        db = get_db_manager()
         
         # Test simple analytics data
         simple_data = {
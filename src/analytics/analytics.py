@@ -9,6 +9,12 @@ from ..models.models import StudentAnalytics, InstagramAnalytics, CrossPlatformA
 class AnalyticsEngine:
     """Analytics engine for Social FIT data analysis."""
     
+    # Columns the analyses read, used to project database reads
+    STUDENT_COLUMNS = ['id', 'gender', 'neighborhood', 'plan_type', 'gympass',
+                       'monthly_value', 'plan_start_date', 'active_plan']
+    INSTAGRAM_COLUMNS = ['id', 'post_date', 'likes', 'comments', 'saves', 'reach',
+                         'profile_visits', 'new_followers', 'main_hashtag', 'engagement_rate']
+    
     def __init__(self):
         """Initialize analytics engine."""
         pass
@@ -86,6 +92,11 @@ class AnalyticsEngine:
                 'reach': 'sum',
                 'new_followers': 'sum'
             }).to_dict('index')
+            # Typed reads give datetime keys, reported as ISO dates
+            daily_performance = {
+                day.strftime('%Y-%m-%d') if hasattr(day, 'strftime') else day: values
+                for day, values in daily_performance.items()
+            }
             
             return InstagramAnalytics(
                 total_posts=total_posts,
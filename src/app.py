@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.etl import SocialFITETL
 from src.config import settings
+from src.database import get_db_manager
 
 def setup_logging():
     """Setup logging configuration."""
@@ -47,8 +48,8 @@ def run_etl_pipeline():
         logger.info("SOCIAL FIT ETL PIPELINE STARTED")
         logger.info("=" * 60)
         
-        # Initialize ETL pipeline
-        etl = SocialFITETL()
+        # Initialize ETL pipeline on the process-wide database connections
+        etl = SocialFITETL(get_db_manager())
         
         # Run full pipeline
         success = etl.run_full_pipeline()
@@ -73,7 +74,7 @@ def run_incremental_update():
     try:
         logger.info("🔄 Running incremental update...")
         
-        etl = SocialFITETL()
+        etl = SocialFITETL(get_db_manager())
         success = etl.run_incremental_update()
         
         if success:
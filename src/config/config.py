@@ -20,16 +20,55 @@ class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: Optional[str] = None
     DATABASE_SCHEMA: str = "social_fit"  # Schema for all tables
+    DB_POOL_SIZE: int = 5  # Connections kept open by the SQLAlchemy pool
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed above the pool size under load
+    DB_POOL_PRE_PING: bool = True  # Check pooled connections before use (drops ones closed by the server)
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    HTTP_MAX_CONNECTIONS: int = 20  # Connections of the shared Supabase HTTP session
+    HTTP_KEEPALIVE_CONNECTIONS: int = 10  # Idle connections kept alive for reuse
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection stays open
+    HTTP_TIMEOUT: float = 120.0  # Seconds per REST request
     
     # Data Paths
     DATA_DIR: str = "data"
-    STUDENTS_FILE: str = "social_fit_alunos.csv"
+    STUDENTS_FILE: str = "social_fit_alunos.csv"  # File name, glob pattern or partition directory
     INSTAGRAM_FILE: str = "social_fit_instagram.csv"
+    CSV_ENGINE: str = "c"  # pandas CSV engine for whole-file reads ("c" or "pyarrow")
+    STREAMING_EXTRACT: bool = False  # Extract/transform/load in chunks instead of whole files
+    EXTRACT_CHUNK_SIZE: int = 50000  # Rows per chunk in streaming mode
+    EXTRACT_BUFFER: int = 2  # Chunks read ahead of the transform in streaming mode (0 = same thread)
+    TRANSFORM_BUFFER: int = 2  # Transformed chunks queued ahead of the loader in streaming mode (0 = same thread)
+    INPUT_CACHE_ENABLED: bool = False  # Cache parsed CSVs as Parquet, keyed by size/mtime/content hash
+    INPUT_CACHE_DIR: str = "data/.cache"
+    INPUT_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    READ_WORKERS: int = 4  # Threads reading the files of a multi-file source in parallel
+    TRACK_INGESTED_FILES: bool = False  # Skip input files already loaded by a previous run
+    INGEST_LEDGER_PATH: str = "data/.ingested.json"
+    PARALLEL_SOURCES: bool = True  # Run the students and Instagram branches concurrently
+    TRANSFORM_WORKERS: int = 1  # Processes for the sharded transform (1 = serial)
+    SHARD_MIN_ROWS: int = 50000  # Frames smaller than this are transformed serially (compared per chunk when streaming)
+    QUARANTINE_ENABLED: bool = False  # Write rejected rows to a quarantine file per run
+    QUARANTINE_DIR: str = "data/quarantine"
+    QUARANTINE_FORMAT: str = "csv"  # "csv" or "parquet"
     
     # Application Configuration
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
     BATCH_SIZE: int = 100
+    MAX_IN_FLIGHT: int = 1  # Concurrent batch requests per load (1 = sequential)
+    ADAPTIVE_BATCHING: bool = False  # Size batches by payload bytes and observed latency
+    BATCH_MIN_SIZE: int = 10
+    BATCH_MAX_SIZE: int = 1000
+    BATCH_MAX_BYTES: int = 512 * 1024  # Serialized payload budget per batch request
+    BATCH_TARGET_LATENCY: float = 1.0  # Seconds per batch request the adaptive batcher aims for
+    BULK_DEDUP: bool = True  # Fetch existing natural keys in pages instead of one query per row
+    DEDUP_PAGE_SIZE: int = 1000  # Rows per page when scanning existing keys (PostgREST max-rows)
+    READ_PAGE_SIZE: int = 1000  # Rows per range() request when reading whole tables (<= PostgREST max-rows)
+    READ_MAX_IN_FLIGHT: int = 4  # Concurrent page requests when reading whole tables
+    ASYNC_MAX_IN_FLIGHT: int = 16  # Concurrent REST requests (pages or batches) of the AsyncDatabaseManager
+    REPLICA_ENABLED: bool = False  # Analytics read local Parquet replicas, syncing only rows past their watermarks
+    REPLICA_DIR: str = "data/replica"
+    LOAD_STRATEGY: str = "insert"  # "insert" (check-then-insert), "upsert" (ON CONFLICT) or "copy" (COPY, needs DATABASE_URL)
     
     # Analytics Configuration
     ANALYTICS_CACHE_TTL: int = 3600
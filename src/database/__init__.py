@@ -5,6 +5,9 @@ Database Module
 Database management and operations for Social FIT.
 """
 
-from .database import DatabaseManager
+from .database import DatabaseManager, get_db_manager, close_db_manager
+from .bulk_loader import PostgresBulkLoader
+from .replica import TableReplica
+from .async_database import AsyncDatabaseManager
 
-__all__ = ['DatabaseManager'] 
\ No newline at end of file
+__all__ = ['DatabaseManager', 'get_db_manager', 'close_db_manager', 'AsyncDatabaseManager', 'PostgresBulkLoader', 'TableReplica'] 
\ No newline at end of file
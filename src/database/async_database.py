@@ -0,0 +1,348 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import aiohttp
+import pandas as pd
+from loguru import logger
+
+from ..config.config import settings, credential_manager
+from ..models.models import Student, InstagramPost
+from ..models.compact import CompactRecords
+from .batching import AdaptiveBatcher, BatchLoadReport, write_batches_async, write_batches_adaptive_async
+from .database import (
+    DatabaseManager, INSTAGRAM_POSTS_CONFLICT_KEY, INSTAGRAM_POSTS_READ_SCHEMA, STUDENTS_CONFLICT_KEY,
+    STUDENTS_READ_SCHEMA, _filter_value
+)
+from .paging import fetch_paged_async
+
+
+def _total_count(content_range: Optional[str]) -> Optional[int]:
+    """Row count from a PostgREST ``Content-Range`` header (``0-999/12345`` or ``*/12345``)."""
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+class AsyncDatabaseManager:
+    """Asyncio counterpart of ``DatabaseManager`` talking to the Supabase REST API over aiohttp.
+
+    It offers the same insert, upsert, check, read and analytics methods as
+    coroutines. Page reads and batch writes are awaited concurrently, at most
+    ``settings.ASYNC_MAX_IN_FLIGHT`` requests at a time, on one keep-alive session,
+    so a single thread can keep dozens of REST calls in flight. Use it as an
+    async context manager, or call ``close`` when done.
+    """
+
+    def __init__(self):
+        if not credential_manager.validate_credentials():
+            raise ValueError("Invalid Supabase credentials. Please check your configuration.")
+
+        supabase_config = credential_manager.get_supabase_config()
+        self.rest_url = f"{supabase_config['url'].rstrip('/')}/rest/v1"
+        self.headers = {
+            'apikey': supabase_config['key'],
+            'Authorization': f"Bearer {supabase_config['key']}",
+            'Content-Type': 'application/json'
+        }
+        self.max_in_flight = settings.ASYNC_MAX_IN_FLIGHT
+        # Created on first use, a session must belong to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.last_load_reports: Dict[str, BatchLoadReport] = {}
+        self._batchers: Dict[str, AdaptiveBatcher] = {}
+
+    async def __aenter__(self) -> 'AsyncDatabaseManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.HTTP_MAX_CONNECTIONS,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT)
+            )
+        return self._session
+
+    async def _request(self, method: str, table: str, params: Optional[Dict[str, Any]] = None,
+                       payload: Any = None, prefer: Optional[str] = None) -> Tuple[Any, Optional[int]]:
+        """Send one REST request; returns the decoded body and the row count, if reported."""
+        headers = {'Prefer': prefer} if prefer else None
+        body = json.dumps(payload, default=str) if payload is not None else None
+        async with self._get_session().request(method, f"{self.rest_url}/{table}", params=params,
+                                               data=body, headers=headers) as response:
+            text = await response.text()
+            if response.status >= 400:
+                raise RuntimeError(f"{method} {table} failed with HTTP {response.status}: {text}")
+            return (json.loads(text) if text else None), _total_count(response.headers.get('Content-Range'))
+
+    async def test_connection(self) -> bool:
+        """Test database connectivity."""
+        try:
+            await self._request('GET', 'students', {'select': 'id', 'limit': 1})
+            logger.info("✅ Database connection successful")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Database connection failed: {e}")
+            return False
+
+    async def _key_exists(self, table: str, key_columns: List[str], key: Tuple[str, ...]) -> bool:
+        params = {'select': 'id', **{column: f"eq.{value}" for column, value in zip(key_columns, key)}}
+        rows, _ = await self._request('GET', table, params)
+        return len(rows) > 0
+
+    async def check_student_exists(self, student: Student) -> bool:
+        """Check if a student already exists in the database."""
+        try:
+            key = DatabaseManager._record_key(DatabaseManager._student_to_record(student), STUDENTS_CONFLICT_KEY)
+            return await self._key_exists('students', STUDENTS_CONFLICT_KEY, key)
+        except Exception as e:
+            logger.error(f"❌ Error checking student existence: {e}")
+            return False
+
+    async def check_instagram_post_exists(self, post: InstagramPost) -> bool:
+        """Check if an Instagram post already exists in the database."""
+        try:
+            key = DatabaseManager._record_key(DatabaseManager._post_to_record(post), INSTAGRAM_POSTS_CONFLICT_KEY)
+            return await self._key_exists('instagram_posts', INSTAGRAM_POSTS_CONFLICT_KEY, key)
+        except Exception as e:
+            logger.error(f"❌ Error checking Instagram post existence: {e}")
+            return False
+
+    async def check_analytics_exists(self, metric_name: str, date: str) -> bool:
+        """Check if analytics for a specific metric and date already exists."""
+        try:
+            rows, _ = await self._request('GET', 'analytics', {
+                'select': 'id', 'metric_name': f"eq.{metric_name}", 'date': f"eq.{date}"
+            })
+            return len(rows) > 0
+        except Exception as e:
+            logger.error(f"❌ Error checking analytics existence: {e}")
+            return False
+
+    async def fetch_table(self, table: str, columns: Optional[List[str]] = None,
+                          schema: Optional[Dict[str, str]] = None, since: Optional[Dict[str, Any]] = None,
+                          page_size: Optional[int] = None) -> pd.DataFrame:
+        """Read a whole table in pages ordered by id, awaited concurrently (see ``DatabaseManager.fetch_table``)."""
+        params: Dict[str, Any] = {'select': ','.join(columns) if columns else '*', 'order': 'id'}
+        if since:
+            params['or'] = f"({','.join(f'{column}.gt.{_filter_value(value)}' for column, value in since.items())})"
+
+        async def fetch_page(start: int, end: int, with_count: bool):
+            rows, total = await self._request('GET', table, {**params, 'offset': start, 'limit': end - start + 1},
+                                              prefer='count=exact' if with_count else None)
+            return rows or [], total if with_count else None
+
+        buffers, total, requests = await fetch_paged_async(fetch_page, page_size or settings.READ_PAGE_SIZE, self.max_in_flight)
+        df = buffers.to_frame(columns, schema)
+        logger.info(f"📥 Read {len(df)} rows from '{table}' in {requests} page request(s)")
+        if isinstance(total, int) and total != len(df):
+            logger.warning(f"'{table}' reported {total} rows but {len(df)} were read (table changed during the read?)")
+        return df
+
+    async def count_rows(self, table: str) -> Optional[int]:
+        """Exact row count of ``table`` without transferring any rows."""
+        _, total = await self._request('HEAD', table, {'select': 'id'}, prefer='count=exact')
+        return total
+
+    async def fetch_existing_keys(self, table: str, key_columns: List[str]) -> Set[Tuple[str, ...]]:
+        """Fetch the natural keys already stored in a table with concurrent paged reads."""
+        df = await self.fetch_table(table, key_columns, page_size=settings.DEDUP_PAGE_SIZE)
+        keys = set(zip(*(df[column].astype(str) for column in key_columns))) if not df.empty else set()
+        logger.info(f"🔑 Fetched {len(keys)} existing keys from '{table}'")
+        return keys
+
+    async def _filter_new_records(self, table: str, records: List[Dict[str, Any]], key_columns: List[str],
+                                  bulk_dedup: bool) -> List[Dict[str, Any]]:
+        """Drop rows whose natural key is already stored (or repeated within ``records``)."""
+        keys = [DatabaseManager._record_key(record, key_columns) for record in records]
+        if bulk_dedup:
+            seen = await self.fetch_existing_keys(table, key_columns)
+        else:
+            # One existence query per row, awaited concurrently
+            slots = asyncio.Semaphore(self.max_in_flight)
+
+            async def exists(key: Tuple[str, ...]) -> bool:
+                async with slots:
+                    return await self._key_exists(table, key_columns, key)
+
+            found = await asyncio.gather(*(exists(key) for key in keys))
+            seen = {key for key, present in zip(keys, found) if present}
+        new_records = []
+        for key, record in zip(keys, records):
+            if key in seen:
+                logger.debug(f"⏭️  Skipping existing {table} row: {key}")
+                continue
+            seen.add(key)
+            new_records.append(record)
+        return new_records
+
+    def _get_batcher(self, table: str) -> AdaptiveBatcher:
+        if table not in self._batchers:
+            self._batchers[table] = AdaptiveBatcher(
+                initial_rows=settings.BATCH_SIZE,
+                min_rows=settings.BATCH_MIN_SIZE,
+                max_rows=settings.BATCH_MAX_SIZE,
+                max_bytes=settings.BATCH_MAX_BYTES,
+                target_latency=settings.BATCH_TARGET_LATENCY
+            )
+        return self._batchers[table]
+
+    async def _write_batches(self, table: str, rows: List[Dict[str, Any]], write) -> BatchLoadReport:
+        """Write rows in batches with up to ``settings.ASYNC_MAX_IN_FLIGHT`` requests in flight."""
+        if settings.ADAPTIVE_BATCHING:
+            report = await write_batches_adaptive_async(table, rows, write, self._get_batcher(table), self.max_in_flight)
+        else:
+            report = await write_batches_async(table, rows, write, settings.BATCH_SIZE, self.max_in_flight)
+        report.log_summary()
+        self.last_load_reports[table] = report
+        return report
+
+    async def _insert_records(self, table: str, label: str, records: List[Dict[str, Any]],
+                              key_columns: List[str], bulk_dedup: Optional[bool]) -> bool:
+        try:
+            if not records:
+                logger.info(f"ℹ️  No {label} to insert")
+                return True
+            if bulk_dedup is None:
+                bulk_dedup = settings.BULK_DEDUP
+
+            new_records = await self._filter_new_records(table, records, key_columns, bulk_dedup)
+            if not new_records:
+                logger.info(f"ℹ️  No new {label} to insert (all already exist)")
+                return True
+
+            report = await self._write_batches(table, new_records, lambda batch: self._request(
+                'POST', table, payload=batch, prefer='return=minimal'))
+            if not report.success:
+                logger.error(f"❌ Failed {label} batches: {sorted(report.failed_batches)}")
+                return False
+
+            logger.info(f"✅ Inserted {len(new_records)} new {label} (skipped {len(records) - len(new_records)} existing)")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Error inserting {label}: {e}")
+            return False
+
+    async def insert_students(self, students: Union[List[Student], pd.DataFrame, CompactRecords],
+                              bulk_dedup: Optional[bool] = None) -> bool:
+        """Insert students data into database with deduplication."""
+        return await self._insert_records('students', 'students', DatabaseManager._student_records(students),
+                                          STUDENTS_CONFLICT_KEY, bulk_dedup)
+
+    async def insert_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame, CompactRecords],
+                                     bulk_dedup: Optional[bool] = None) -> bool:
+        """Insert Instagram posts data into database with deduplication."""
+        return await self._insert_records('instagram_posts', 'Instagram posts', DatabaseManager._post_records(posts),
+                                          INSTAGRAM_POSTS_CONFLICT_KEY, bulk_dedup)
+
+    async def _upsert_records(self, table: str, label: str, records: List[Dict[str, Any]],
+                              conflict_key: List[str], ignore_duplicates: bool) -> bool:
+        try:
+            if not records:
+                logger.info(f"ℹ️  No {label} to upsert")
+                return True
+
+            # ON CONFLICT cannot touch the same row twice in one statement, keep the last occurrence
+            rows = list({tuple(record[column] for column in conflict_key): record for record in records}.values())
+            resolution = 'ignore-duplicates' if ignore_duplicates else 'merge-duplicates'
+            report = await self._write_batches(table, rows, lambda batch: self._request(
+                'POST', table, {'on_conflict': ','.join(conflict_key)}, batch,
+                prefer=f"resolution={resolution},return=minimal"))
+            if not report.success:
+                logger.error(f"❌ Failed {label} batches: {sorted(report.failed_batches)}")
+                return False
+
+            logger.info(f"✅ Upserted {report.rows_written} {label}")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Error upserting {label}: {e}")
+            return False
+
+    async def upsert_students(self, students: Union[List[Student], pd.DataFrame, CompactRecords],
+                              ignore_duplicates: bool = False) -> bool:
+        """Load students with one idempotent upsert per batch on (name, birth_date)."""
+        return await self._upsert_records('students', 'students', DatabaseManager._student_records(students),
+                                          STUDENTS_CONFLICT_KEY, ignore_duplicates)
+
+    async def upsert_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame, CompactRecords],
+                                     ignore_duplicates: bool = False) -> bool:
+        """Load Instagram posts with one idempotent upsert per batch on (post_date, main_hashtag)."""
+        return await self._upsert_records('instagram_posts', 'Instagram posts', DatabaseManager._post_records(posts),
+                                          INSTAGRAM_POSTS_CONFLICT_KEY, ignore_duplicates)
+
+    async def insert_analytics(self, analytics_data: Dict[str, Any]) -> bool:
+        """Insert analytics data into database with deduplication."""
+        try:
+            date_value = analytics_data.get('date')
+            if hasattr(date_value, 'isoformat'):
+                date_value = date_value.isoformat()
+
+            metric_name = analytics_data.get('metric_name')
+            if await self.check_analytics_exists(metric_name, date_value):
+                logger.info(f"ℹ️  Analytics for {metric_name} on {date_value} already exists, skipping")
+                return True
+
+            await self._request('POST', 'analytics', payload={
+                'date': date_value,
+                'metric_name': metric_name,
+                'metric_value': json.dumps(analytics_data.get('metric_value'), default=str)
+            }, prefer='return=minimal')
+            logger.info(f"✅ Inserted analytics data: {metric_name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Error inserting analytics: {e}")
+            return False
+
+    async def get_students(self, columns: Optional[List[str]] = None,
+                           schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Retrieve students data from database, projected and typed like ``DatabaseManager.get_students``."""
+        try:
+            df = await self.fetch_table('students', columns, STUDENTS_READ_SCHEMA if schema is None else schema)
+            logger.info(f"✅ Retrieved {len(df)} students from database")
+            return df
+        except Exception as e:
+            logger.error(f"❌ Error retrieving students: {e}")
+            return pd.DataFrame()
+
+    async def get_instagram_posts(self, columns: Optional[List[str]] = None,
+                                  schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Retrieve Instagram posts data from database, projected and typed like ``DatabaseManager.get_instagram_posts``."""
+        try:
+            df = await self.fetch_table('instagram_posts', columns,
+                                        INSTAGRAM_POSTS_READ_SCHEMA if schema is None else schema)
+            logger.info(f"✅ Retrieved {len(df)} Instagram posts from database")
+            return df
+        except Exception as e:
+            logger.error(f"❌ Error retrieving Instagram posts: {e}")
+            return pd.DataFrame()
+
+    async def get_analytics(self, metric_name: str = None) -> pd.DataFrame:
+        """Retrieve analytics data from database."""
+        try:
+            params = {'select': '*'}
+            if metric_name:
+                params['metric_name'] = f"eq.{metric_name}"
+            rows, _ = await self._request('GET', 'analytics', params)
+            df = pd.DataFrame(rows)
+            logger.info(f"✅ Retrieved {len(df)} analytics records from database")
+            return df
+        except Exception as e:
+            logger.error(f"❌ Error retrieving analytics: {e}")
+            return pd.DataFrame()
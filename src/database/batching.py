@@ -0,0 +1,235 @@
+import asyncio
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+
+@dataclass
+class BatchResult:
+    """Outcome of writing a single batch."""
+    index: int
+    rows: int
+    success: bool
+    elapsed: float
+    error: str = ""
+    bytes: int = 0
+
+
+@dataclass
+class BatchLoadReport:
+    """Per-batch results of a batched load into one table."""
+    table: str
+    results: List[BatchResult] = field(default_factory=list)
+
+    @property
+    def rows_written(self) -> int:
+        return sum(result.rows for result in self.results if result.success)
+
+    @property
+    def failed_batches(self) -> Dict[int, str]:
+        return {result.index: result.error for result in self.results if not result.success}
+
+    @property
+    def success(self) -> bool:
+        return not self.failed_batches
+
+    def add(self, result: BatchResult, total: Optional[int] = None) -> None:
+        """Log one batch result and keep it."""
+        position = f"{result.index + 1}/{total}" if total else f"{result.index + 1}"
+        if result.success:
+            logger.info(f"Wrote batch {position} into {self.table} ({result.rows} rows, {result.elapsed:.2f}s)")
+        else:
+            logger.error(f"❌ Batch {position} into {self.table} failed: {result.error}")
+        self.results.append(result)
+
+    def finish(self) -> 'BatchLoadReport':
+        """Order the results by batch index (concurrent batches complete in any order)."""
+        self.results.sort(key=lambda result: result.index)
+        return self
+
+    def log_summary(self) -> None:
+        """Log aggregated statistics for this load."""
+        if not self.results:
+            return
+        sizes = [result.rows for result in self.results]
+        latencies = sorted(result.elapsed for result in self.results)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        logger.info(
+            f"📈 {self.table}: {len(self.results)} batches, {self.rows_written} rows, "
+            f"{sum(result.bytes for result in self.results) / 1024:.0f} KiB, "
+            f"{len(self.failed_batches)} failed, batch size {min(sizes)}-{max(sizes)}, "
+            f"latency avg {sum(latencies) / len(latencies):.2f}s / p95 {p95:.2f}s"
+        )
+
+
+class AdaptiveBatcher:
+    """Sizes batches by serialized byte budget and adapts the row count to observed
+    latency and errors, within ``[min_rows, max_rows]``."""
+
+    def __init__(self, initial_rows: int, min_rows: int, max_rows: int,
+                 max_bytes: int, target_latency: float):
+        self.min_rows = max(1, min_rows)
+        self.max_rows = max(self.min_rows, max_rows)
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.rows_limit = min(max(initial_rows, self.min_rows), self.max_rows)
+
+    def batches(self, rows: List[Dict[str, Any]]) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+        """Yield ``(batch, payload_bytes)`` lazily, so each batch uses the latest size limit."""
+        batch, size = [], 0
+        for row in rows:
+            row_bytes = len(json.dumps(row, default=str)) + 1
+            if batch and (len(batch) >= self.rows_limit or size + row_bytes > self.max_bytes):
+                yield batch, size
+                batch, size = [], 0
+            batch.append(row)
+            size += row_bytes
+        if batch:
+            yield batch, size
+
+    def record(self, result: BatchResult) -> None:
+        """Grow on fast successes, shrink proportionally on slow ones and halve on errors."""
+        if not result.success:
+            new_limit = self.rows_limit // 2
+        elif result.elapsed > self.target_latency:
+            new_limit = int(self.rows_limit * self.target_latency / result.elapsed)
+        elif result.elapsed < self.target_latency / 2 and result.rows >= self.rows_limit:
+            new_limit = int(self.rows_limit * 1.5) + 1
+        else:
+            return
+        self.rows_limit = min(max(new_limit, self.min_rows), self.max_rows)
+
+
+def _split(rows: List[Dict[str, Any]], batch_size: int) -> List[List[Dict[str, Any]]]:
+    return [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+
+def _batch_result(index: int, batch: List[Dict[str, Any]], started: float, payload_bytes: int,
+                  error: Optional[Exception] = None) -> BatchResult:
+    """Result of a batch write that started at ``started`` and raised ``error``, if any."""
+    elapsed = time.perf_counter() - started
+    if error is None:
+        return BatchResult(index, len(batch), True, elapsed, bytes=payload_bytes)
+    return BatchResult(index, len(batch), False, elapsed, str(error), payload_bytes)
+
+
+def _adaptive_recorder(report: BatchLoadReport, batcher: AdaptiveBatcher) -> Callable[[BatchResult], None]:
+    """Feed every result to ``batcher`` before the report keeps it."""
+    def record(result: BatchResult) -> None:
+        batcher.record(result)
+        report.add(result)
+    return record
+
+
+def _run_batch(write: Callable[[List[Dict[str, Any]]], Any], index: int,
+               batch: List[Dict[str, Any]], payload_bytes: int = 0) -> BatchResult:
+    """Write one batch, capturing the error instead of raising it."""
+    started = time.perf_counter()
+    try:
+        write(batch)
+    except Exception as e:
+        return _batch_result(index, batch, started, payload_bytes, e)
+    return _batch_result(index, batch, started, payload_bytes)
+
+
+def write_batches(table: str, rows: List[Dict[str, Any]], write: Callable[[List[Dict[str, Any]]], Any],
+                  batch_size: int, max_in_flight: int = 1) -> BatchLoadReport:
+    """Split rows into batches and write them with at most ``max_in_flight`` requests in flight.
+
+    A failing batch is recorded by index in the returned report and does not stop the others.
+    """
+    batches = _split(rows, batch_size)
+    report = BatchLoadReport(table)
+
+    if max_in_flight <= 1:
+        for index, batch in enumerate(batches):
+            report.add(_run_batch(write, index, batch), len(batches))
+    else:
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=f"load-{table}") as executor:
+            futures = [executor.submit(_run_batch, write, index, batch) for index, batch in enumerate(batches)]
+            for future in as_completed(futures):
+                report.add(future.result(), len(batches))
+
+    return report.finish()
+
+
+def write_batches_adaptive(table: str, rows: List[Dict[str, Any]], write: Callable[[List[Dict[str, Any]]], Any],
+                           batcher: AdaptiveBatcher, max_in_flight: int = 1) -> BatchLoadReport:
+    """Like ``write_batches`` but batches are cut by ``batcher`` and resized after every result."""
+    report = BatchLoadReport(table)
+    record = _adaptive_recorder(report, batcher)
+    batches = enumerate(batcher.batches(rows))
+
+    if max_in_flight <= 1:
+        for index, (batch, payload_bytes) in batches:
+            record(_run_batch(write, index, batch, payload_bytes))
+    else:
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=f"load-{table}") as executor:
+            pending = set()
+            for index, (batch, payload_bytes) in batches:
+                pending.add(executor.submit(_run_batch, write, index, batch, payload_bytes))
+                # Only cut the next batch once a slot is free, so it sees the latest feedback
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result())
+            for future in as_completed(pending):
+                record(future.result())
+
+    return report.finish()
+
+
+async def _run_batch_async(write: Callable[[List[Dict[str, Any]]], Awaitable[Any]], index: int,
+                           batch: List[Dict[str, Any]], payload_bytes: int = 0) -> BatchResult:
+    """Await one batch write, capturing the error instead of raising it."""
+    started = time.perf_counter()
+    try:
+        await write(batch)
+    except Exception as e:
+        return _batch_result(index, batch, started, payload_bytes, e)
+    return _batch_result(index, batch, started, payload_bytes)
+
+
+async def write_batches_async(table: str, rows: List[Dict[str, Any]],
+                              write: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+                              batch_size: int, max_in_flight: int = 1) -> BatchLoadReport:
+    """Coroutine version of ``write_batches``: batch writes are awaited concurrently,
+    at most ``max_in_flight`` at a time, from a single thread."""
+    batches = _split(rows, batch_size)
+    report = BatchLoadReport(table)
+    slots = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def run(index: int, batch: List[Dict[str, Any]]) -> None:
+        async with slots:
+            result = await _run_batch_async(write, index, batch)
+        report.add(result, len(batches))
+
+    await asyncio.gather(*(run(index, batch) for index, batch in enumerate(batches)))
+    return report.finish()
+
+
+async def write_batches_adaptive_async(table: str, rows: List[Dict[str, Any]],
+                                       write: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+                                       batcher: AdaptiveBatcher, max_in_flight: int = 1) -> BatchLoadReport:
+    """Coroutine version of ``write_batches_adaptive``."""
+    report = BatchLoadReport(table)
+    record = _adaptive_recorder(report, batcher)
+    pending = set()
+
+    for index, (batch, payload_bytes) in enumerate(batcher.batches(rows)):
+        pending.add(asyncio.create_task(_run_batch_async(write, index, batch, payload_bytes)))
+        # Only cut the next batch once a slot is free, so it sees the latest feedback
+        if len(pending) >= max(1, max_in_flight):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                record(task.result())
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        for task in done:
+            record(task.result())
+
+    return report.finish()
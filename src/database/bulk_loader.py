@@ -0,0 +1,100 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, List
+
+from loguru import logger
+from sqlalchemy.engine import Engine
+
+
+class _CSVStream(io.TextIOBase):
+    """Read-only file object that renders records as CSV lines on demand."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], columns: List[str], rows_per_chunk: int = 1000):
+        self._records = iter(records)
+        self._columns = columns
+        self._rows_per_chunk = rows_per_chunk
+        self._buffer = ""
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_chunk(self) -> str:
+        """Render the next group of records, empty string when exhausted."""
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        for _ in range(self._rows_per_chunk):
+            try:
+                record = next(self._records)
+            except StopIteration:
+                break
+            writer.writerow([record.get(column) for column in self._columns])
+            self.rows += 1
+        return out.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class PostgresBulkLoader:
+    """Bulk loader that streams rows through COPY FROM STDIN into a staging table
+    and merges them into the target table with a single INSERT ... ON CONFLICT."""
+
+    def __init__(self, engine: Engine, schema: str):
+        self.engine = engine
+        self.schema = schema
+
+    def copy_merge(self, table: str, records: Iterable[Dict[str, Any]], columns: List[str],
+                   conflict_key: List[str], update_existing: bool = True) -> int:
+        """Stream records into ``schema.table`` via a temp staging table; returns rows copied."""
+        target = f"{self.schema}.{table}"
+        staging = f"staging_{table}"
+        column_list = ', '.join(columns)
+        key_list = ', '.join(conflict_key)
+
+        update_columns = [column for column in columns if column not in conflict_key]
+        if update_existing and update_columns:
+            conflict_action = "DO UPDATE SET " + ', '.join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+        else:
+            conflict_action = "DO NOTHING"
+
+        # A key repeated in the input keeps its last row, like the REST upsert path
+        merge_sql = (
+            f"INSERT INTO {target} ({column_list}) "
+            f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging} "
+            f"ORDER BY {key_list}, _row_number DESC "
+            f"ON CONFLICT ({key_list}) {conflict_action}"
+        )
+
+        stream = _CSVStream(records, columns)
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {target} WITH NO DATA"
+            )
+            # Numbers rows in COPY order, so the merge can tell which duplicate came last
+            cursor.execute(f"ALTER TABLE {staging} ADD COLUMN _row_number BIGSERIAL")
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", stream)
+            cursor.execute(merge_sql)
+            merged = cursor.rowcount
+            raw_conn.commit()
+            cursor.close()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        logger.info(f"📦 COPY loaded {stream.rows} rows into {target} ({merged} inserted/updated)")
+        return stream.rows
@@ -1,12 +1,57 @@
 import pandas as pd
+import numpy as np
 from supabase import create_client, Client
 from sqlalchemy import create_engine, text
 from loguru import logger
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+import atexit
 import json
+import os
+import threading
+import httpx
+from contextlib import contextmanager
+from supabase.lib.client_options import SyncClientOptions
 
 from ..config.config import settings, credential_manager
 from ..models.models import Student, InstagramPost
+from ..models.compact import CompactRecords
+from .bulk_loader import PostgresBulkLoader
+from .batching import AdaptiveBatcher, BatchLoadReport, write_batches, write_batches_adaptive
+from .paging import fetch_paged
+from .replica import TableReplica
+
+# Natural keys used for deduplication and as ON CONFLICT targets
+STUDENTS_CONFLICT_KEY = ['name', 'birth_date']
+INSTAGRAM_POSTS_CONFLICT_KEY = ['post_date', 'main_hashtag']
+
+# Column dtypes decoded by the table readers (columns not listed keep their JSON values)
+STUDENTS_READ_SCHEMA = {
+    'id': 'int64', 'gender': 'category', 'birth_date': 'datetime64[ns]', 'neighborhood': 'category',
+    'plan_type': 'category', 'gympass': 'bool', 'monthly_value': 'float64', 'total_value': 'float64',
+    'plan_start_date': 'datetime64[ns]', 'active_plan': 'bool',
+    'created_at': 'datetime64[ns]', 'updated_at': 'datetime64[ns]'
+}
+INSTAGRAM_POSTS_READ_SCHEMA = {
+    'id': 'int64', 'post_date': 'datetime64[ns]', 'likes': 'int64', 'comments': 'int64', 'saves': 'int64',
+    'reach': 'int64', 'profile_visits': 'int64', 'new_followers': 'int64', 'main_hashtag': 'category',
+    'engagement_rate': 'float64', 'created_at': 'datetime64[ns]', 'updated_at': 'datetime64[ns]'
+}
+READ_SCHEMAS = {'students': STUDENTS_READ_SCHEMA, 'instagram_posts': INSTAGRAM_POSTS_READ_SCHEMA}
+
+# High-water mark columns of the local replicas, a sync fetches rows past any of them.
+# updated_at is moved by the BEFORE UPDATE triggers of create_tables, which also fire on the
+# DO UPDATE branch of upserts and COPY merges.
+REPLICA_WATERMARKS = {
+    'students': ['id', 'created_at', 'updated_at'],
+    'instagram_posts': ['id', 'created_at', 'updated_at']
+}
+
+
+def _filter_value(value: Any) -> str:
+    """Format a watermark for a PostgREST filter (timestamps quoted, they contain reserved characters)."""
+    if isinstance(value, pd.Timestamp):
+        return f'"{value.isoformat()}"'
+    return str(value.item() if isinstance(value, np.generic) else value)
 
 class DatabaseManager:
     """Manages database connections and operations for Social FIT ETL."""
@@ -17,22 +62,64 @@ class DatabaseManager:
         if not credential_manager.validate_credentials():
             raise ValueError("Invalid Supabase credentials. Please check your configuration.")
         
-        # Initialize Supabase client with validated credentials
+        # Initialize Supabase client with validated credentials, on one keep-alive HTTP session
         supabase_config = credential_manager.get_supabase_config()
-        self.supabase: Client = create_client(supabase_config['url'], supabase_config['key'])
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=settings.HTTP_TIMEOUT,
+            follow_redirects=True
+        )
+        self.supabase: Client = create_client(
+            supabase_config['url'], supabase_config['key'],
+            options=SyncClientOptions(httpx_client=self.http_client)
+        )
         
         # Initialize SQLAlchemy engine only if DATABASE_URL is provided and valid
         self.engine = None
+        self.bulk_loader = None
         if settings.DATABASE_URL and settings.DATABASE_URL.strip():
             try:
-                self.engine = create_engine(settings.DATABASE_URL)
+                self.engine = create_engine(
+                    settings.DATABASE_URL,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_pre_ping=settings.DB_POOL_PRE_PING,
+                    pool_recycle=settings.DB_POOL_RECYCLE
+                )
+                self.bulk_loader = PostgresBulkLoader(self.engine, settings.DATABASE_SCHEMA)
                 logger.info("SQLAlchemy engine initialized for direct database access")
             except Exception as e:
                 logger.warning(f"Could not initialize SQLAlchemy engine: {e}")
                 self.engine = None
+                self.bulk_loader = None
+        
+        # Per-table batch results of the most recent load
+        self.last_load_reports: Dict[str, BatchLoadReport] = {}
+        # Per-table adaptive batch sizers, kept so learned sizes carry over between loads
+        self._batchers: Dict[str, AdaptiveBatcher] = {}
+        # Natural keys known to exist, only populated inside ``cached_keys()``
+        self._key_cache: Optional[Dict[str, Set[Tuple[str, ...]]]] = None
+        # Local Parquet replicas of the source tables, read with ``local=True``
+        self.replicas: Dict[str, TableReplica] = {}
+        if settings.REPLICA_ENABLED:
+            self.replicas = {
+                table: TableReplica(os.path.join(settings.REPLICA_DIR, f"{table}.parquet"), columns)
+                for table, columns in REPLICA_WATERMARKS.items()
+            }
         
         logger.info("Database manager initialized successfully")
         
+    def close(self):
+        """Release the pooled database connections and the HTTP session."""
+        if self.engine is not None:
+            self.engine.dispose()
+        self.http_client.close()
+        logger.info("Database manager connections closed")
+        
     def test_connection(self) -> bool:
         """Test database connectivity."""
         try:
@@ -86,9 +173,26 @@ class DatabaseManager:
                     new_followers INTEGER NOT NULL,
                     main_hashtag VARCHAR(100) NOT NULL,
                     engagement_rate DECIMAL(5,4),
-                    created_at TIMESTAMP DEFAULT NOW()
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    updated_at TIMESTAMP DEFAULT NOW()
                 );
                 """
+                # Every update moves updated_at, the watermark the local replicas sync on
+                updated_at_sql = f"""
+                ALTER TABLE {schema_name}.instagram_posts ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+                CREATE OR REPLACE FUNCTION {schema_name}.set_updated_at() RETURNS TRIGGER AS $$
+                BEGIN
+                    NEW.updated_at = NOW();
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+                DROP TRIGGER IF EXISTS students_set_updated_at ON {schema_name}.students;
+                CREATE TRIGGER students_set_updated_at BEFORE UPDATE ON {schema_name}.students
+                    FOR EACH ROW EXECUTE FUNCTION {schema_name}.set_updated_at();
+                DROP TRIGGER IF EXISTS instagram_posts_set_updated_at ON {schema_name}.instagram_posts;
+                CREATE TRIGGER instagram_posts_set_updated_at BEFORE UPDATE ON {schema_name}.instagram_posts
+                    FOR EACH ROW EXECUTE FUNCTION {schema_name}.set_updated_at();
+                """
                 # Create analytics table in social_fit schema
                 analytics_table_sql = f"""
                 CREATE TABLE IF NOT EXISTS {schema_name}.analytics (
@@ -99,6 +203,13 @@ class DatabaseManager:
                     created_at TIMESTAMP DEFAULT NOW()
                 );
                 """
+                # Unique natural keys backing the upsert (ON CONFLICT) load path
+                unique_keys_sql = f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_students_name_birth_date
+                    ON {schema_name}.students ({', '.join(STUDENTS_CONFLICT_KEY)});
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_instagram_posts_post_date_hashtag
+                    ON {schema_name}.instagram_posts ({', '.join(INSTAGRAM_POSTS_CONFLICT_KEY)});
+                """
                 with self.engine.connect() as conn:
                     conn.execute(text(create_schema_sql))
                     conn.execute(text(students_table_sql))
@@ -106,8 +217,28 @@ class DatabaseManager:
                     conn.execute(text(analytics_table_sql))
                     conn.commit()
                 logger.info(f"✅ Tables created in schema '{schema_name}'")
+                try:
+                    with self.engine.connect() as conn:
+                        conn.execute(text(updated_at_sql))
+                        conn.commit()
+                    logger.info(f"✅ updated_at triggers ensured in schema '{schema_name}'")
+                except Exception as e:
+                    # Without the triggers, replica syncs would silently miss updated rows
+                    if settings.REPLICA_ENABLED:
+                        raise RuntimeError(f"Could not install the updated_at triggers the replicas need: {e}") from e
+                    logger.warning(f"⚠️  Could not install the updated_at triggers: {e}")
+                try:
+                    with self.engine.connect() as conn:
+                        conn.execute(text(unique_keys_sql))
+                        conn.commit()
+                    logger.info(f"✅ Unique natural keys ensured in schema '{schema_name}'")
+                except Exception as e:
+                    logger.warning(f"⚠️  Could not create unique natural keys (run scripts/clean_duplicates.py first): {e}")
             else:
                 logger.info(f"⚠️  Skipping direct database table creation (no valid DATABASE_URL)")
+                if settings.REPLICA_ENABLED:
+                    logger.warning("⚠️  Replicas need the updated_at triggers of supabase_setup.py, "
+                                   "they cannot be checked without DATABASE_URL")
             # Test if tables exist
             self._ensure_tables_exist()
         except Exception as e:
@@ -128,8 +259,7 @@ class DatabaseManager:
     def check_student_exists(self, student: Student) -> bool:
         """Check if a student already exists in the database."""
         try:
-            result = self.supabase.table('students').select('id').eq('name', student.name).eq('birth_date', student.birth_date.date().isoformat()).execute()
-            return len(result.data) > 0
+            return self._key_exists('students', STUDENTS_CONFLICT_KEY, self._record_key(self._student_to_record(student), STUDENTS_CONFLICT_KEY))
         except Exception as e:
             logger.error(f"❌ Error checking student existence: {e}")
             return False
@@ -137,8 +267,7 @@ class DatabaseManager:
     def check_instagram_post_exists(self, post: InstagramPost) -> bool:
         """Check if an Instagram post already exists in the database."""
         try:
-            result = self.supabase.table('instagram_posts').select('id').eq('post_date', post.date.date().isoformat()).eq('main_hashtag', post.main_hashtag).execute()
-            return len(result.data) > 0
+            return self._key_exists('instagram_posts', INSTAGRAM_POSTS_CONFLICT_KEY, self._record_key(self._post_to_record(post), INSTAGRAM_POSTS_CONFLICT_KEY))
         except Exception as e:
             logger.error(f"❌ Error checking Instagram post existence: {e}")
             return False
@@ -152,93 +281,353 @@ class DatabaseManager:
             logger.error(f"❌ Error checking analytics existence: {e}")
             return False
     
-    def insert_students(self, students: List[Student]) -> bool:
-        """Insert students data into database with deduplication."""
+    def fetch_existing_keys(self, table: str, key_columns: List[str]) -> Set[Tuple[str, ...]]:
+        """Fetch the natural keys already stored in a table with parallel paged reads."""
+        df = self.fetch_table(table, key_columns, page_size=settings.DEDUP_PAGE_SIZE)
+        keys = set(zip(*(df[column].astype(str) for column in key_columns))) if not df.empty else set()
+        logger.info(f"🔑 Fetched {len(keys)} existing keys from '{table}'")
+        return keys
+    
+    def _key_exists(self, table: str, key_columns: List[str], key: Tuple[str, ...]) -> bool:
+        """Check whether a row with the given natural key exists (one request)."""
+        query = self.supabase.table(table).select('id')
+        for column, value in zip(key_columns, key):
+            query = query.eq(column, value)
+        result = query.execute()
+        return len(result.data) > 0
+    
+    @staticmethod
+    def _record_key(record: Dict[str, Any], key_columns: List[str]) -> Tuple[str, ...]:
+        """Natural key of a serialized row, normalized like ``fetch_existing_keys``."""
+        return tuple(str(record[column]) for column in key_columns)
+    
+    @staticmethod
+    def _student_to_record(student: Student) -> Dict[str, Any]:
+        """Serialize a student into a database row."""
+        return {
+            'name': str(student.name),
+            'gender': str(student.gender.value),
+            'birth_date': student.birth_date.date().isoformat(),
+            'address': str(student.address),
+            'neighborhood': str(student.neighborhood),
+            'plan_type': str(student.plan_type.value),
+            'gympass': bool(student.gympass),
+            'monthly_value': float(student.monthly_value),
+            'total_value': float(student.total_value),
+            'plan_start_date': student.plan_start_date.date().isoformat(),
+            'active_plan': bool(student.active_plan)
+        }
+    
+    @staticmethod
+    def _post_to_record(post: InstagramPost) -> Dict[str, Any]:
+        """Serialize an Instagram post into a database row."""
+        engagement_rate = (post.likes + post.comments + post.saves) / post.reach if post.reach > 0 else 0
+        return {
+            'post_date': post.date.date().isoformat(),
+            'likes': int(post.likes),
+            'comments': int(post.comments),
+            'saves': int(post.saves),
+            'reach': int(post.reach),
+            'profile_visits': int(post.profile_visits),
+            'new_followers': int(post.new_followers),
+            'main_hashtag': str(post.main_hashtag),
+            'engagement_rate': float(engagement_rate)
+        }
+    
+    @staticmethod
+    def _student_frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Serialize a typed student column batch (see ``src.etl.columnar``) into database rows."""
+        rows = pd.DataFrame({
+            'name': frame['name'].astype(str),
+            'gender': frame['gender'].astype(str),
+            'birth_date': frame['birth_date'].dt.strftime('%Y-%m-%d'),
+            'address': frame['address'].astype(str),
+            'neighborhood': frame['neighborhood'].astype(str),
+            'plan_type': frame['plan_type'].astype(str),
+            'gympass': frame['gympass'].astype(bool),
+            'monthly_value': frame['monthly_value'].astype(float),
+            'total_value': frame['total_value'].astype(float),
+            'plan_start_date': frame['plan_start_date'].dt.strftime('%Y-%m-%d'),
+            'active_plan': frame['active_plan'].astype(bool)
+        })
+        return rows.to_dict('records')
+    
+    @staticmethod
+    def _student_records(students: Union[List[Student], pd.DataFrame, CompactRecords]) -> List[Dict[str, Any]]:
+        """Serialize students given as models, a typed column batch or compact records."""
+        if isinstance(students, CompactRecords):
+            students = students.to_frame()
+        if isinstance(students, pd.DataFrame):
+            return DatabaseManager._student_frame_to_records(students)
+        return [DatabaseManager._student_to_record(student) for student in students]
+    
+    @staticmethod
+    def _post_frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Serialize a typed Instagram column batch (see ``src.etl.columnar``) into database rows."""
+        counts = ['likes', 'comments', 'saves', 'reach', 'profile_visits', 'new_followers']
+        if 'engagement_rate' in frame.columns:
+            engagement_rate = frame['engagement_rate'].to_numpy(dtype=float)
+        else:
+            interactions = (frame['likes'] + frame['comments'] + frame['saves']).to_numpy(dtype=float)
+            reach = frame['reach'].to_numpy(dtype=float)
+            engagement_rate = np.divide(interactions, reach, out=np.zeros_like(interactions), where=reach > 0)
+        rows = pd.DataFrame({'post_date': frame['date'].dt.strftime('%Y-%m-%d')})
+        for column in counts:
+            rows[column] = frame[column].astype('int64')
+        rows['main_hashtag'] = frame['main_hashtag'].astype(str)
+        rows['engagement_rate'] = engagement_rate
+        return rows.to_dict('records')
+    
+    @staticmethod
+    def _post_records(posts: Union[List[InstagramPost], pd.DataFrame, CompactRecords]) -> List[Dict[str, Any]]:
+        """Serialize Instagram posts given as models, a typed column batch or compact records."""
+        if isinstance(posts, CompactRecords):
+            posts = posts.to_frame()
+        if isinstance(posts, pd.DataFrame):
+            return DatabaseManager._post_frame_to_records(posts)
+        return [DatabaseManager._post_to_record(post) for post in posts]
+    
+    @contextmanager
+    def cached_keys(self):
+        """Reuse the bulk-dedup key sets across several inserts (e.g. the chunks of one load).
+        
+        Keys are fetched once per table and extended with the rows of every batch
+        written successfully; the cache is dropped on exit so later loads see fresh
+        database state.
+        """
+        self._key_cache = {}
         try:
+            yield self
+        finally:
+            self._key_cache = None
+    
+    def _existing_keys(self, table: str, key_columns: List[str]) -> Set[Tuple[str, ...]]:
+        """Existing natural keys, served from ``cached_keys()`` when active."""
+        if self._key_cache is None:
+            return self.fetch_existing_keys(table, key_columns)
+        if table not in self._key_cache:
+            self._key_cache[table] = self.fetch_existing_keys(table, key_columns)
+        return self._key_cache[table]
+    
+    def _filter_new_records(self, table: str, records: List[Dict[str, Any]], key_columns: List[str],
+                            bulk_dedup: bool) -> List[Dict[str, Any]]:
+        """Drop rows whose natural key is already stored (or repeated within ``records``)."""
+        if not records:
+            return []
+        existing = self._existing_keys(table, key_columns) if bulk_dedup else set()
+        seen = set()
+        new_records = []
+        for record in records:
+            key = self._record_key(record, key_columns)
+            if key in existing or key in seen or (not bulk_dedup and self._key_exists(table, key_columns, key)):
+                logger.debug(f"⏭️  Skipping existing {table} row: {key}")
+                continue
+            seen.add(key)
+            new_records.append(record)
+        return new_records
+    
+    def _insert_batches(self, table: str, rows: List[Dict[str, Any]], key_columns: List[str]) -> BatchLoadReport:
+        """Insert rows in batches; inside ``cached_keys()`` each written batch's keys join the cache."""
+        def write(batch: List[Dict[str, Any]]):
+            self.supabase.table(table).insert(batch).execute()
+            # Only keys of batches that were actually written, a failed batch is retried by the next load
+            if self._key_cache is not None and table in self._key_cache:
+                self._key_cache[table].update(self._record_key(record, key_columns) for record in batch)
+        
+        return self._write_batches(table, rows, write)
+    
+    def insert_students(self, students: Union[List[Student], pd.DataFrame], bulk_dedup: Optional[bool] = None) -> bool:
+        """Insert students data into database with deduplication.
+        
+        With ``bulk_dedup`` (default: ``settings.BULK_DEDUP``) the existing
+        (name, birth_date) keys are fetched in pages and diffed in memory,
+        instead of issuing one existence query per student.
+        """
+        try:
+            if len(students) == 0:
+                logger.info("ℹ️  No students to insert")
+                return True
+            if bulk_dedup is None:
+                bulk_dedup = settings.BULK_DEDUP
+            
             # Filter out existing students
-            new_students = []
-            for student in students:
-                if not self.check_student_exists(student):
-                    new_students.append(student)
-                else:
-                    logger.debug(f"⏭️  Skipping existing student: {student.name}")
+            students_data = self._student_records(students)
+            new_students = self._filter_new_records('students', students_data, STUDENTS_CONFLICT_KEY, bulk_dedup)
             
             if not new_students:
                 logger.info("ℹ️  No new students to insert (all already exist)")
                 return True
             
-            students_data = []
-            for student in new_students:
-                students_data.append({
-                    'name': str(student.name),
-                    'gender': str(student.gender.value),
-                    'birth_date': student.birth_date.date().isoformat(),
-                    'address': str(student.address),
-                    'neighborhood': str(student.neighborhood),
-                    'plan_type': str(student.plan_type.value),
-                    'gympass': bool(student.gympass),
-                    'monthly_value': float(student.monthly_value),
-                    'total_value': float(student.total_value),
-                    'plan_start_date': student.plan_start_date.date().isoformat(),
-                    'active_plan': bool(student.active_plan)
-                })
-            
-            batch_size = settings.BATCH_SIZE
+            report = self._insert_batches('students', new_students, STUDENTS_CONFLICT_KEY)
+            if not report.success:
+                logger.error(f"❌ Failed student batches: {sorted(report.failed_batches)}")
+                return False
             
-            for i in range(0, len(students_data), batch_size):
-                batch = students_data[i:i + batch_size]
-                result = self.supabase.table('students').insert(batch).execute()
-                logger.info(f"Inserted batch {i//batch_size + 1} of new students")
-            
-            logger.info(f"✅ Inserted {len(new_students)} new students (skipped {len(students) - len(new_students)} existing)")
+            logger.info(f"✅ Inserted {len(new_students)} new students (skipped {len(students_data) - len(new_students)} existing)")
             return True
             
         except Exception as e:
             logger.error(f"❌ Error inserting students: {e}")
             return False
     
-    def insert_instagram_posts(self, posts: List[InstagramPost]) -> bool:
-        """Insert Instagram posts data into database with deduplication."""
+    def insert_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame], bulk_dedup: Optional[bool] = None) -> bool:
+        """Insert Instagram posts data into database with deduplication.
+        
+        With ``bulk_dedup`` (default: ``settings.BULK_DEDUP``) the existing
+        (post_date, main_hashtag) keys are fetched in pages and diffed in
+        memory, instead of issuing one existence query per post.
+        """
         try:
+            if len(posts) == 0:
+                logger.info("ℹ️  No Instagram posts to insert")
+                return True
+            if bulk_dedup is None:
+                bulk_dedup = settings.BULK_DEDUP
+            
             # Filter out existing posts
-            new_posts = []
-            for post in posts:
-                if not self.check_instagram_post_exists(post):
-                    new_posts.append(post)
-                else:
-                    logger.debug(f"⏭️  Skipping existing post: {post.date.date()} - {post.main_hashtag}")
+            posts_data = self._post_records(posts)
+            new_posts = self._filter_new_records('instagram_posts', posts_data, INSTAGRAM_POSTS_CONFLICT_KEY, bulk_dedup)
             
             if not new_posts:
                 logger.info("ℹ️  No new Instagram posts to insert (all already exist)")
                 return True
             
-            posts_data = []
-            for post in new_posts:
-                engagement_rate = (post.likes + post.comments + post.saves) / post.reach if post.reach > 0 else 0
-                posts_data.append({
-                    'post_date': post.date.date().isoformat(),
-                    'likes': int(post.likes),
-                    'comments': int(post.comments),
-                    'saves': int(post.saves),
-                    'reach': int(post.reach),
-                    'profile_visits': int(post.profile_visits),
-                    'new_followers': int(post.new_followers),
-                    'main_hashtag': str(post.main_hashtag),
-                    'engagement_rate': float(engagement_rate)
-                })
+            report = self._insert_batches('instagram_posts', new_posts, INSTAGRAM_POSTS_CONFLICT_KEY)
+            if not report.success:
+                logger.error(f"❌ Failed Instagram post batches: {sorted(report.failed_batches)}")
+                return False
             
-            batch_size = settings.BATCH_SIZE
+            logger.info(f"✅ Inserted {len(new_posts)} new Instagram posts (skipped {len(posts_data) - len(new_posts)} existing)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error inserting Instagram posts: {e}")
+            return False
+    
+    def _get_batcher(self, table: str) -> AdaptiveBatcher:
+        """Return the adaptive batch sizer for a table, creating it from settings."""
+        if table not in self._batchers:
+            self._batchers[table] = AdaptiveBatcher(
+                initial_rows=settings.BATCH_SIZE,
+                min_rows=settings.BATCH_MIN_SIZE,
+                max_rows=settings.BATCH_MAX_SIZE,
+                max_bytes=settings.BATCH_MAX_BYTES,
+                target_latency=settings.BATCH_TARGET_LATENCY
+            )
+        return self._batchers[table]
+    
+    def _write_batches(self, table: str, rows: List[Dict[str, Any]], write) -> BatchLoadReport:
+        """Write rows in batches with up to ``settings.MAX_IN_FLIGHT`` concurrent requests.
+        
+        Batches are ``settings.BATCH_SIZE`` rows, or sized per table by byte budget and
+        observed latency when ``settings.ADAPTIVE_BATCHING`` is enabled.
+        """
+        if settings.ADAPTIVE_BATCHING:
+            report = write_batches_adaptive(table, rows, write, self._get_batcher(table), settings.MAX_IN_FLIGHT)
+        else:
+            report = write_batches(table, rows, write, settings.BATCH_SIZE, settings.MAX_IN_FLIGHT)
+        report.log_summary()
+        self.last_load_reports[table] = report
+        return report
+    
+    def _upsert_records(self, table: str, records: List[Dict[str, Any]], conflict_key: List[str],
+                        ignore_duplicates: bool) -> int:
+        """Upsert records in batches on the given natural key; returns the number of rows sent."""
+        # ON CONFLICT cannot touch the same row twice in one statement, keep the last occurrence
+        unique_records = {tuple(record[column] for column in conflict_key): record for record in records}
+        rows = list(unique_records.values())
+        
+        on_conflict = ','.join(conflict_key)
+        
+        report = self._write_batches(table, rows, lambda batch: self.supabase.table(table).upsert(
+            batch, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates).execute())
+        if not report.success:
+            raise RuntimeError(f"{len(report.failed_batches)} batch(es) failed: {sorted(report.failed_batches)}")
+        
+        return report.rows_written
+    
+    def upsert_students(self, students: Union[List[Student], pd.DataFrame], ignore_duplicates: bool = False) -> bool:
+        """Load students with one idempotent upsert per batch on (name, birth_date).
+        
+        Requires the unique index created by ``create_tables``. Existing rows are
+        updated unless ``ignore_duplicates`` is set, in which case they are left untouched.
+        """
+        try:
+            if len(students) == 0:
+                logger.info("ℹ️  No students to upsert")
+                return True
             
-            for i in range(0, len(posts_data), batch_size):
-                batch = posts_data[i:i + batch_size]
-                result = self.supabase.table('instagram_posts').insert(batch).execute()
-                logger.info(f"Inserted batch {i//batch_size + 1} of new Instagram posts")
+            records = self._student_records(students)
+            count = self._upsert_records('students', records, STUDENTS_CONFLICT_KEY, ignore_duplicates)
             
-            logger.info(f"✅ Inserted {len(new_posts)} new Instagram posts (skipped {len(posts) - len(new_posts)} existing)")
+            logger.info(f"✅ Upserted {count} students")
             return True
             
         except Exception as e:
-            logger.error(f"❌ Error inserting Instagram posts: {e}")
+            logger.error(f"❌ Error upserting students: {e}")
+            return False
+    
+    def upsert_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame], ignore_duplicates: bool = False) -> bool:
+        """Load Instagram posts with one idempotent upsert per batch on (post_date, main_hashtag).
+        
+        Requires the unique index created by ``create_tables``. Existing rows are
+        updated unless ``ignore_duplicates`` is set, in which case they are left untouched.
+        """
+        try:
+            if len(posts) == 0:
+                logger.info("ℹ️  No Instagram posts to upsert")
+                return True
+            
+            records = self._post_records(posts)
+            count = self._upsert_records('instagram_posts', records, INSTAGRAM_POSTS_CONFLICT_KEY, ignore_duplicates)
+            
+            logger.info(f"✅ Upserted {count} Instagram posts")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error upserting Instagram posts: {e}")
+            return False
+    
+    def copy_students(self, students: Union[List[Student], pd.DataFrame]) -> bool:
+        """Bulk load students through COPY FROM STDIN and an ON CONFLICT merge (requires DATABASE_URL)."""
+        try:
+            if self.bulk_loader is None:
+                logger.error("❌ COPY loading requires a valid DATABASE_URL")
+                return False
+            if len(students) == 0:
+                logger.info("ℹ️  No students to copy")
+                return True
+            
+            records = self._student_records(students)
+            columns = list(records[0].keys())
+            count = self.bulk_loader.copy_merge('students', records, columns, STUDENTS_CONFLICT_KEY)
+            
+            logger.info(f"✅ Copied {count} students")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error copying students: {e}")
+            return False
+    
+    def copy_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame]) -> bool:
+        """Bulk load Instagram posts through COPY FROM STDIN and an ON CONFLICT merge (requires DATABASE_URL)."""
+        try:
+            if self.bulk_loader is None:
+                logger.error("❌ COPY loading requires a valid DATABASE_URL")
+                return False
+            if len(posts) == 0:
+                logger.info("ℹ️  No Instagram posts to copy")
+                return True
+            
+            records = self._post_records(posts)
+            columns = list(records[0].keys())
+            count = self.bulk_loader.copy_merge('instagram_posts', records, columns, INSTAGRAM_POSTS_CONFLICT_KEY)
+            
+            logger.info(f"✅ Copied {count} Instagram posts")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error copying Instagram posts: {e}")
             return False
     
     def insert_analytics(self, analytics_data: Dict[str, Any]) -> bool:
@@ -270,22 +659,111 @@ class DatabaseManager:
             logger.error(f"❌ Error inserting analytics: {e}")
             return False
     
-    def get_students(self) -> pd.DataFrame:
-        """Retrieve students data from database."""
+    def fetch_table(self, table: str, columns: Optional[List[str]] = None,
+                    schema: Optional[Dict[str, str]] = None, since: Optional[Dict[str, Any]] = None,
+                    page_size: Optional[int] = None) -> pd.DataFrame:
+        """Read a whole table with ``range()`` pages ordered by id, fetched in parallel.
+        
+        Only ``columns`` are selected (all by default), and with ``since`` only rows
+        where any of the given columns is past its value. Pages are ``page_size`` rows
+        (default ``settings.READ_PAGE_SIZE``) and are buffered column by
+        column and the DataFrame is built once, decoding the columns in ``schema``
+        to typed arrays, so tables larger than the PostgREST row cap are read completely.
+        """
+        selection = ','.join(columns) if columns else '*'
+        condition = ','.join(f"{column}.gt.{_filter_value(value)}" for column, value in since.items()) if since else None
+        
+        def fetch_page(start: int, end: int, with_count: bool):
+            if with_count:
+                query = self.supabase.table(table).select(selection, count='exact')
+            else:
+                query = self.supabase.table(table).select(selection)
+            if condition:
+                query = query.or_(condition)
+            result = query.order('id').range(start, end).execute()
+            return result.data or [], result.count if with_count else None
+        
+        buffers, total, requests = fetch_paged(fetch_page, page_size or settings.READ_PAGE_SIZE, settings.READ_MAX_IN_FLIGHT)
+        df = buffers.to_frame(columns, schema)
+        logger.info(f"📥 Read {len(df)} rows from '{table}' in {requests} page request(s)")
+        if isinstance(total, int) and total != len(df):
+            logger.warning(f"'{table}' reported {total} rows but {len(df)} were read (table changed during the read?)")
+        return df
+    
+    def count_rows(self, table: str) -> Optional[int]:
+        """Exact row count of ``table`` without transferring any rows."""
+        return self.supabase.table(table).select('id', count='exact', head=True).execute().count
+    
+    def sync_replica(self, table: str) -> pd.DataFrame:
+        """Fetch the rows of ``table`` past the local replica's watermarks and merge them in.
+        
+        Transfer is proportional to the new and updated rows. When the merged replica
+        and the table disagree on the row count (rows were deleted), or the table lacks
+        a watermark column, it is rebuilt from a full read.
+        """
+        replica = self.replicas[table]
+        schema = READ_SCHEMAS[table]
+        with replica.lock:
+            marks = replica.watermarks()
+            if marks and not set(replica.watermark_columns) <= set(replica.load().columns):
+                # Without every watermark column (e.g. no updated_at yet) updates would go unnoticed
+                logger.warning(f"'{table}' lacks a watermark column of {replica.watermark_columns}; reading it in full")
+                delta = self.fetch_table(table, schema=schema)
+                df = replica.replace(delta)
+            else:
+                delta = self.fetch_table(table, schema=schema, since=marks or None)
+                df = replica.merge(delta)
+                if marks:
+                    remote_rows = self.count_rows(table)
+                    if isinstance(remote_rows, int) and remote_rows != len(df):
+                        logger.warning(f"Replica of '{table}' has {len(df)} rows, table has {remote_rows}; rebuilding it")
+                        df = replica.replace(self.fetch_table(table, schema=schema))
+        logger.info(f"🔄 Synced replica of '{table}': {len(delta)} new or updated rows, {len(df)} total")
+        return df
+    
+    def read_replica(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read ``table`` from its local replica after syncing it (a stale replica is served if the sync fails)."""
+        replica = self.replicas[table]
         try:
-            result = self.supabase.table('students').select('*').execute()
-            df = pd.DataFrame(result.data)
+            self.sync_replica(table)
+        except Exception as e:
+            if not replica.exists():
+                raise
+            logger.warning(f"Could not sync replica of '{table}', reading the local copy: {e}")
+        return replica.load(columns)
+    
+    def get_students(self, columns: Optional[List[str]] = None,
+                     schema: Optional[Dict[str, str]] = None, local: bool = False) -> pd.DataFrame:
+        """Retrieve students data from database.
+        
+        ``columns`` projects the read; values are decoded with ``schema``
+        (default ``STUDENTS_READ_SCHEMA``). With ``local`` the rows come from the
+        synced local replica, when replicas are enabled.
+        """
+        try:
+            if local and 'students' in self.replicas:
+                df = self.read_replica('students', columns)
+            else:
+                df = self.fetch_table('students', columns, STUDENTS_READ_SCHEMA if schema is None else schema)
             logger.info(f"✅ Retrieved {len(df)} students from database")
             return df
         except Exception as e:
             logger.error(f"❌ Error retrieving students: {e}")
             return pd.DataFrame()
     
-    def get_instagram_posts(self) -> pd.DataFrame:
-        """Retrieve Instagram posts data from database."""
+    def get_instagram_posts(self, columns: Optional[List[str]] = None,
+                            schema: Optional[Dict[str, str]] = None, local: bool = False) -> pd.DataFrame:
+        """Retrieve Instagram posts data from database.
+        
+        ``columns`` projects the read; values are decoded with ``schema``
+        (default ``INSTAGRAM_POSTS_READ_SCHEMA``). With ``local`` the rows come from
+        the synced local replica, when replicas are enabled.
+        """
         try:
-            result = self.supabase.table('instagram_posts').select('*').execute()
-            df = pd.DataFrame(result.data)
+            if local and 'instagram_posts' in self.replicas:
+                df = self.read_replica('instagram_posts', columns)
+            else:
+                df = self.fetch_table('instagram_posts', columns, INSTAGRAM_POSTS_READ_SCHEMA if schema is None else schema)
             logger.info(f"✅ Retrieved {len(df)} Instagram posts from database")
             return df
         except Exception as e:
@@ -315,4 +793,32 @@ class DatabaseManager:
                 self.supabase.table(table).delete().neq('id', 0).execute()
                 logger.info(f"✅ Cleared table: {table}")
             except Exception as e:
-                logger.error(f"❌ Error clearing table {table}: {e}") 
\ No newline at end of file
+                logger.error(f"❌ Error clearing table {table}: {e}") 
+
+
+_shared_manager: Optional[DatabaseManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_db_manager() -> DatabaseManager:
+    """Process-wide DatabaseManager, created on first use and reused by every later caller.
+    
+    Scheduled runs and scripts share its warm HTTP session and connection pool
+    instead of revalidating credentials and reconnecting each time. It is closed
+    at interpreter exit, or explicitly with ``close_db_manager``.
+    """
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = DatabaseManager()
+            atexit.register(close_db_manager)
+        return _shared_manager
+
+
+def close_db_manager():
+    """Close the process-wide DatabaseManager; the next ``get_db_manager`` creates a new one."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is not None:
+            _shared_manager.close()
+            _shared_manager = None
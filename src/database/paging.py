@@ -0,0 +1,183 @@
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# fetch_page(start, end, with_count) -> (rows, exact row count or None)
+PageFetcher = Callable[[int, int, bool], Tuple[List[Dict[str, Any]], Optional[int]]]
+AsyncPageFetcher = Callable[[int, int, bool], Awaitable[Tuple[List[Dict[str, Any]], Optional[int]]]]
+
+
+def decode_column(values: list, dtype: str) -> Any:
+    """Decode JSON values of one column straight into a typed array.
+
+    ``dtype`` is a pandas dtype name: ``datetime64[ns]`` (ISO strings), ``float64``
+    (numbers or DECIMAL strings), ``int64``, ``bool`` (nullable variants when
+    values are missing), ``category`` or anything else to keep the values as is.
+    """
+    has_missing = any(value is None for value in values)
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(values, format='ISO8601', errors='coerce', utc='UTC' in dtype).astype(dtype)
+    if dtype == 'float64':
+        return pd.to_numeric(np.asarray(values, dtype=object), errors='coerce').astype('float64')
+    if dtype == 'int64':
+        return pd.array(values, dtype='Int64') if has_missing else np.asarray(values, dtype=np.int64)
+    if dtype == 'bool':
+        return pd.array(values, dtype='boolean') if has_missing else np.asarray(values, dtype=bool)
+    if dtype == 'category':
+        return pd.Categorical(values)
+    return values
+
+
+class ColumnBuffers:
+    """Accumulates JSON row pages column by column; pages may arrive in any order.
+
+    Each page is split into per-column lists as soon as it arrives, so the row
+    dicts can be dropped, and the DataFrame is built once in page order.
+    """
+
+    def __init__(self):
+        self._pages: Dict[int, Tuple[int, Dict[str, list]]] = {}
+        self.rows = 0
+
+    def add(self, index: int, rows: List[Dict[str, Any]]) -> None:
+        names = list(rows[0]) if rows else []
+        self._pages[index] = (len(rows), {name: [row.get(name) for row in rows] for name in names})
+        self.rows += len(rows)
+
+    def column_names(self) -> List[str]:
+        names: Dict[str, None] = {}
+        for _, columns in self._pages.values():
+            names.update(dict.fromkeys(columns))
+        return list(names)
+
+    def column(self, name: str) -> list:
+        """All values of one column in page order (None where a page lacks the column)."""
+        pages = [self._pages[index] for index in sorted(self._pages)]
+        return list(chain.from_iterable(columns.get(name, [None] * rows) for rows, columns in pages))
+
+    def to_frame(self, columns: Optional[List[str]] = None, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Build the DataFrame once, decoding the columns listed in ``schema`` to their dtypes."""
+        names = columns or self.column_names()
+        schema = schema or {}
+        return pd.DataFrame({
+            name: decode_column(self.column(name), schema[name]) if name in schema else self.column(name)
+            for name in names
+        }, columns=names)
+
+
+class _PagePlan:
+    """Page bounds and result accounting shared by ``fetch_paged`` and ``fetch_paged_async``.
+
+    The first page also asks for the exact row count; the remaining pages it
+    implies can then be fetched concurrently, and pages past them (no count, or
+    rows added meanwhile) one after another until a short page. When the first
+    page comes back short although the count says there is more, the server caps
+    rows per request and the page size is lowered to that cap.
+    """
+
+    def __init__(self, page_size: int, max_in_flight: int):
+        self.page_size = page_size
+        self.max_in_flight = max_in_flight
+        self.buffers = ColumnBuffers()
+        self.total: Optional[int] = None
+        self.requests = 0
+        self.next_page = 0
+
+    def bounds(self, page: int) -> Tuple[int, int]:
+        """Inclusive ``range()`` bounds of ``page``."""
+        return page * self.page_size, (page + 1) * self.page_size - 1
+
+    def add(self, page: int, rows: List[Dict[str, Any]]) -> bool:
+        """Buffer one fetched page; True when it is short, i.e. the last one."""
+        self.buffers.add(page, rows)
+        self.requests += 1
+        return len(rows) < self.page_size
+
+    def add_first(self, rows: List[Dict[str, Any]], total: Optional[int]) -> bool:
+        self.total = total
+        self.next_page = 1
+        if isinstance(total, int) and 0 < len(rows) < min(self.page_size, total):
+            # A short first page of a larger table means the server caps rows per request
+            # (PostgREST max-rows): page by that cap instead of stopping here
+            logger.warning(f"Server returned {len(rows)} of {self.page_size} requested rows, paging by {len(rows)}")
+            self.page_size = len(rows)
+        return self.add(0, rows)
+
+    def concurrent_pages(self) -> range:
+        """Pages after the first implied by the row count, empty when they cannot be planned."""
+        if not isinstance(self.total, int) or self.max_in_flight <= 1:
+            return range(0)
+        return range(1, max(1, math.ceil(self.total / self.page_size)))
+
+    def finish_concurrent(self, pages: range) -> bool:
+        """Move past the concurrently fetched pages; True when the table ended within them."""
+        self.next_page = pages.stop
+        return self.buffers.rows < pages.stop * self.page_size
+
+    def add_next(self, rows: List[Dict[str, Any]]) -> bool:
+        done = self.add(self.next_page, rows)
+        self.next_page += 1
+        return done
+
+    def result(self) -> Tuple[ColumnBuffers, Optional[int], int]:
+        return self.buffers, self.total, self.requests
+
+
+def fetch_paged(fetch_page: PageFetcher, page_size: int, max_in_flight: int = 1) -> Tuple[ColumnBuffers, Optional[int], int]:
+    """Fetch every page of a range-paginated query into column buffers.
+
+    The first request also asks for the exact row count; the remaining pages it
+    implies are then fetched ``max_in_flight`` at a time. Without a count, or for
+    rows added meanwhile, pages are read one after another until a short page.
+    Returns the buffers, the reported row count and the number of requests.
+    """
+    plan = _PagePlan(page_size, max_in_flight)
+    if plan.add_first(*fetch_page(*plan.bounds(0), True)):
+        return plan.result()
+
+    pages = plan.concurrent_pages()
+    if pages:
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="fetch") as executor:
+            futures = {executor.submit(fetch_page, *plan.bounds(page), False): page for page in pages}
+            for future in as_completed(futures):
+                plan.add(futures[future], future.result()[0])
+        if plan.finish_concurrent(pages):
+            return plan.result()
+
+    while True:
+        rows, _ = fetch_page(*plan.bounds(plan.next_page), False)
+        if plan.add_next(rows):
+            return plan.result()
+
+
+async def fetch_paged_async(fetch_page: AsyncPageFetcher, page_size: int,
+                            max_in_flight: int = 1) -> Tuple[ColumnBuffers, Optional[int], int]:
+    """Coroutine version of ``fetch_paged``: the pages implied by the first request's
+    count are awaited together, at most ``max_in_flight`` at a time."""
+    plan = _PagePlan(page_size, max_in_flight)
+    if plan.add_first(*await fetch_page(*plan.bounds(0), True)):
+        return plan.result()
+
+    pages = plan.concurrent_pages()
+    if pages:
+        slots = asyncio.Semaphore(max_in_flight)
+
+        async def fetch(page: int) -> None:
+            async with slots:
+                rows, _ = await fetch_page(*plan.bounds(page), False)
+            plan.add(page, rows)
+
+        await asyncio.gather(*(fetch(page) for page in pages))
+        if plan.finish_concurrent(pages):
+            return plan.result()
+
+    while True:
+        rows, _ = await fetch_page(*plan.bounds(plan.next_page), False)
+        if plan.add_next(rows):
+            return plan.result()
@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+
+class TableReplica:
+    """Local Parquet copy of one database table, kept current through high-water marks.
+
+    The replica tracks the largest value of each watermark column (``id``,
+    ``created_at`` and, for students, ``updated_at``). A sync fetches only the rows
+    past any of them and ``merge`` folds them in by ``key``, fetched rows replacing
+    the local ones. Rows changed without moving a watermark are not seen; deleted
+    rows are handled by ``replace`` with a full read.
+    """
+
+    def __init__(self, path: str, watermark_columns: Sequence[str], key: str = 'id'):
+        self.path = path
+        self.watermark_columns = list(watermark_columns)
+        self.key = key
+        self.lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+
+    def exists(self) -> bool:
+        return self._frame is not None or os.path.exists(self.path)
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The replicated rows (kept in memory after the first read), optionally projected."""
+        if self._frame is None:
+            self._frame = pd.read_parquet(self.path) if os.path.exists(self.path) else pd.DataFrame()
+        if columns and not self._frame.empty:
+            return self._frame[columns]
+        return self._frame
+
+    def watermarks(self) -> Dict[str, Any]:
+        """Largest value of each watermark column present in the replica."""
+        frame = self.load()
+        marks: Dict[str, Any] = {}
+        for column in self.watermark_columns:
+            if column in frame.columns and frame[column].notna().any():
+                marks[column] = frame[column].max()
+        return marks
+
+    def merge(self, delta: pd.DataFrame) -> pd.DataFrame:
+        """Fold fetched rows into the replica and persist it; returns the merged rows."""
+        frame = self.load()
+        if delta.empty:
+            return frame
+        if frame.empty:
+            merged = delta
+        else:
+            merged = pd.concat([frame[~frame[self.key].isin(delta[self.key])], delta], ignore_index=True)
+        # Categories of the replica and the delta differ, concat leaves those columns as objects
+        categorical = {column: 'category' for column in delta.columns if isinstance(delta[column].dtype, pd.CategoricalDtype)}
+        return self.replace(merged.astype(categorical).sort_values(self.key, ignore_index=True))
+
+    def replace(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Persist ``frame`` as the whole replica (written aside, then swapped in)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        frame.to_parquet(temporary, index=False)
+        os.replace(temporary, self.path)
+        self._frame = frame
+        return frame
@@ -5,6 +5,6 @@ ETL Pipeline Module
 Extract, Transform, Load pipeline for Social FIT data integration.
 """
 
-from .etl_pipeline import SocialFITETL
+from .etl_pipeline import SocialFITETL, PipelineResult
 
-__all__ = ['SocialFITETL'] 
\ No newline at end of file
+__all__ = ['SocialFITETL', 'PipelineResult'] 
\ No newline at end of file
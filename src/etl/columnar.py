@@ -0,0 +1,195 @@
+import pandas as pd
+import numpy as np
+from enum import Enum
+from typing import Dict, List, Type
+from pydantic import BaseModel
+
+from src.models import Student, InstagramPost, Gender, PlanType, CompactRecords, validate_records
+
+
+class ColumnarBatch:
+    """Typed column batch produced by a columnar transform.
+
+    ``frame`` holds the valid rows with model field names as columns, ``errors``
+    holds one boolean mask per field for every input row (True = invalid) and
+    ``coerced`` counts values that were replaced by a default instead of
+    rejecting the row. Models are only built when ``to_models`` is called.
+    """
+
+    def __init__(self, frame: pd.DataFrame, errors: pd.DataFrame, messages: Dict[str, str], model: Type[BaseModel],
+                 coerced: Dict[str, int] = None):
+        self.frame = frame
+        self.errors = errors
+        self.messages = messages
+        self.model = model
+        self.coerced = coerced or {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def invalid_mask(self) -> pd.Series:
+        """Boolean mask over the input rows, True where at least one field is invalid."""
+        return self.errors.any(axis=1)
+
+    @property
+    def rejected_count(self) -> int:
+        return int(self.invalid_mask.sum())
+
+    def error_summary(self) -> Dict[str, int]:
+        """Number of invalid values per field (fields without errors are omitted)."""
+        counts = self.errors.sum()
+        return {field: int(count) for field, count in counts.items() if count}
+
+    def error_categories(self) -> pd.Series:
+        """Invalid fields of each invalid input row joined with ``+`` (e.g. ``gender+birth_date``)."""
+        invalid = self.errors[self.invalid_mask]
+        fields = np.array(invalid.columns)
+        return pd.Series(['+'.join(fields[row]) for row in invalid.to_numpy()], index=invalid.index, dtype=object)
+
+    def reasons(self) -> pd.Series:
+        """Human readable rejection reason per invalid input row."""
+        invalid = self.errors[self.invalid_mask]
+        fields = np.array(invalid.columns)
+        return pd.Series(
+            ['; '.join(f"{field}: {self.messages[field]}" for field in fields[row]) for row in invalid.to_numpy()],
+            index=invalid.index,
+            dtype=object
+        )
+
+    def to_models(self, validate: bool = False) -> List[BaseModel]:
+        """Build Pydantic models for the valid rows.
+
+        The columns are already validated, so models are constructed on the trusted
+        fast path unless ``validate`` asks for a full bulk Pydantic validation.
+        """
+        fields = self.model.model_fields
+        frame = self.frame[list(fields)]
+        if validate:
+            return validate_records(self.model, frame.to_dict('records'))
+
+        # model_construct stores values as given, so enum fields need their members
+        # (in an explicit object column, pandas would otherwise store str enums as plain strings)
+        for name, field in fields.items():
+            if isinstance(field.annotation, type) and issubclass(field.annotation, Enum):
+                members = list(field.annotation)
+                codes = pd.Categorical(frame[name], categories=[member.value for member in members]).codes
+                frame = frame.assign(**{name: pd.Series(np.array(members, dtype=object)[codes], index=frame.index, dtype=object)})
+        return validate_records(self.model, frame.to_dict('records'), trusted=True)
+
+    def to_compact(self) -> CompactRecords:
+        """Struct-of-arrays form of the valid rows, much smaller than a list of models."""
+        return CompactRecords.from_frame(self.frame, self.model)
+
+
+class _ColumnValidator:
+    """Accumulates coerced columns, invalid masks and messages for one input DataFrame."""
+
+    def __init__(self, df: pd.DataFrame, model: Type[BaseModel]):
+        self.df = df
+        self.aliases = {name: field.alias or name for name, field in model.model_fields.items()}
+        self.columns: Dict[str, pd.Series] = {}
+        self.errors: Dict[str, pd.Series] = {}
+        self.messages: Dict[str, str] = {}
+        self.coerced: Dict[str, int] = {}
+
+    def source(self, field: str) -> pd.Series:
+        alias = self.aliases[field]
+        if alias in self.df.columns:
+            return self.df[alias]
+        self.messages[field] = f"missing column '{alias}'"
+        return pd.Series(None, index=self.df.index, dtype=object)
+
+    def add(self, field: str, values: pd.Series, invalid: pd.Series, message: str) -> None:
+        self.columns[field] = values
+        self.errors[field] = invalid.fillna(True).astype(bool)
+        self.messages.setdefault(field, message)
+
+    def integer(self, field: str) -> None:
+        values = pd.to_numeric(self.source(field), errors='coerce')
+        self.add(field, values, values.isna() | (values % 1 != 0), "not an integer")
+
+    def count(self, field: str) -> None:
+        # Unparseable counts default to 0 (as in the row-wise transform) and are only tallied
+        values = pd.to_numeric(self.source(field), errors='coerce')
+        column_missing = field in self.messages
+        missing = values.isna()
+        if missing.any() and not column_missing:
+            self.coerced[field] = int(missing.sum())
+        self.add(field, values.fillna(0).astype('int64'), pd.Series(column_missing, index=self.df.index), "")
+
+    def number(self, field: str) -> None:
+        values = pd.to_numeric(self.source(field), errors='coerce').astype(float)
+        self.add(field, values, values.isna(), "not a number")
+
+    @staticmethod
+    def _as_text(raw: pd.Series) -> pd.Series:
+        # Categorical columns from the typed reader stay categorical
+        return raw if isinstance(raw.dtype, pd.CategoricalDtype) else raw.astype(str)
+
+    def text(self, field: str) -> None:
+        raw = self.source(field)
+        self.add(field, self._as_text(raw), raw.isna(), "missing value")
+
+    def date(self, field: str) -> None:
+        values = pd.to_datetime(self.source(field), errors='coerce')
+        self.add(field, values, values.isna(), "invalid date")
+
+    def choice(self, field: str, allowed: List[str]) -> None:
+        raw = self.source(field)
+        self.add(field, self._as_text(raw), ~raw.isin(allowed), f"must be one of {', '.join(allowed)}")
+
+    def boolean(self, field: str) -> None:
+        # Anything other than "true" is False, matching the original row-wise conversion
+        values = self.source(field).astype(str).str.strip().str.lower() == 'true'
+        self.add(field, values, pd.Series(False, index=self.df.index), "")
+
+    def build(self, model: Type[BaseModel]) -> ColumnarBatch:
+        errors = pd.DataFrame(self.errors, index=self.df.index)
+        invalid = errors.any(axis=1)
+        frame = pd.DataFrame(self.columns, index=self.df.index)[~invalid]
+        return ColumnarBatch(frame, errors, self.messages, model, self.coerced)
+
+
+def transform_students_frame(students_df: pd.DataFrame) -> ColumnarBatch:
+    """Validate and coerce a raw students export column by column."""
+    validator = _ColumnValidator(students_df, Student)
+    validator.integer('id')
+    validator.text('name')
+    validator.choice('gender', [gender.value for gender in Gender])
+    validator.date('birth_date')
+    validator.text('address')
+    validator.text('neighborhood')
+    validator.choice('plan_type', [plan.value for plan in PlanType])
+    validator.boolean('gympass')
+    validator.number('monthly_value')
+    validator.number('total_value')
+    validator.date('plan_start_date')
+    validator.boolean('active_plan')
+
+    batch = validator.build(Student)
+    batch.frame = batch.frame.astype({'id': 'int64'})
+    return batch
+
+
+def engagement_rate(likes: np.ndarray, comments: np.ndarray, saves: np.ndarray, reach: np.ndarray) -> np.ndarray:
+    """(likes + comments + saves) / reach, 0 where reach is not positive."""
+    interactions = np.asarray(likes + comments + saves, dtype=float)
+    reach = np.asarray(reach, dtype=float)
+    return np.divide(interactions, reach, out=np.zeros_like(interactions), where=reach > 0)
+
+
+def transform_instagram_frame(instagram_df: pd.DataFrame) -> ColumnarBatch:
+    """Validate and coerce a raw Instagram export column by column, adding engagement_rate."""
+    validator = _ColumnValidator(instagram_df, InstagramPost)
+    validator.date('date')
+    for field in ['likes', 'comments', 'saves', 'reach', 'profile_visits', 'new_followers']:
+        validator.count(field)
+    validator.text('main_hashtag')
+
+    batch = validator.build(InstagramPost)
+    frame = batch.frame
+    batch.frame = frame.assign(engagement_rate=engagement_rate(
+        frame['likes'].to_numpy(), frame['comments'].to_numpy(), frame['saves'].to_numpy(), frame['reach'].to_numpy()
+    ))
+    return batch
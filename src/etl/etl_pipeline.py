@@ -1,7 +1,10 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Any, Iterator, Optional, Type, Union
+from pydantic import BaseModel
 from loguru import logger
 import os
 
@@ -9,29 +12,75 @@ from src.config import settings
 from src.models import Student, InstagramPost
 from src.database import DatabaseManager
 from src.analytics import AnalyticsEngine
+from .input_cache import InputCache
+from .schema import csv_schema, read_csv_typed
+from .sources import IngestLedger, read_many, resolve_source_files, tag_origin
+from .quarantine import QuarantineSink, RejectionTally
+from .stages import prefetch
+from .sharding import ShardedTransformer
+from .columnar import ColumnarBatch, transform_students_frame, transform_instagram_frame
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run; truthy when the run succeeded."""
+    success: bool
+    rejected_rows: Dict[str, int] = field(default_factory=dict)
+    rejected_by_error: Dict[str, int] = field(default_factory=dict)
+    quarantine_path: Optional[str] = None
+    
+    def __bool__(self) -> bool:
+        return self.success
 
 class SocialFITETL:
     """Main ETL pipeline for Social FIT data integration."""
     
-    def __init__(self):
-        """Initialize ETL pipeline."""
-        self.db_manager = DatabaseManager()
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        """Initialize ETL pipeline, on ``db_manager`` when given (e.g. the shared one) or a new manager."""
+        self.db_manager = db_manager or DatabaseManager()
         self.analytics_engine = AnalyticsEngine()
         
+        # Parsed inputs are reused across runs while the CSV files are unchanged
+        self.input_cache = None
+        if settings.INPUT_CACHE_ENABLED:
+            self.input_cache = InputCache(settings.INPUT_CACHE_DIR, settings.INPUT_CACHE_MAX_BYTES)
+        
+        # Input files are units of work: once loaded, a rerun skips them
+        self.ingest_ledger = None
+        if settings.TRACK_INGESTED_FILES:
+            self.ingest_ledger = IngestLedger(settings.INGEST_LEDGER_PATH)
+        self.extracted_files: List[str] = []
+        
+        # Large frames and chunks are transformed in shards on a process pool
+        self.sharder = ShardedTransformer(settings.TRANSFORM_WORKERS, settings.SHARD_MIN_ROWS)
+        if settings.TRANSFORM_WORKERS > 1 and settings.STREAMING_EXTRACT and settings.SHARD_MIN_ROWS > settings.EXTRACT_CHUNK_SIZE:
+            logger.warning(f"SHARD_MIN_ROWS ({settings.SHARD_MIN_ROWS}) exceeds EXTRACT_CHUNK_SIZE "
+                           f"({settings.EXTRACT_CHUNK_SIZE}), streamed chunks will not be sharded")
+        
+        # Rejected rows are counted per run and, when enabled, written in bulk to a quarantine file
+        self.rejections = RejectionTally()
+        self.quarantine = self._new_quarantine()
+        
         # Configure logging
         logger.add("logs/etl_{time}.log", rotation="1 day", retention="7 days", level=settings.LOG_LEVEL)
         
+    def _new_quarantine(self) -> Optional[QuarantineSink]:
+        """Quarantine sink for one run, writing to a timestamped file in ``settings.QUARANTINE_DIR``."""
+        if not settings.QUARANTINE_ENABLED:
+            return None
+        file_name = f"rejected_{datetime.now():%Y%m%d_%H%M%S_%f}.{settings.QUARANTINE_FORMAT}"
+        return QuarantineSink(os.path.join(settings.QUARANTINE_DIR, file_name), settings.QUARANTINE_FORMAT)
+    
     def extract_data(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """Extract data from CSV files."""
         try:
+            self.extracted_files = []
+            
             # Read students data
-            students_file = os.path.join(settings.DATA_DIR, settings.STUDENTS_FILE)
-            students_df = pd.read_csv(students_file)
+            students_df = self._read_source(settings.STUDENTS_FILE, Student)
             logger.info(f"Extracted {len(students_df)} student records")
             
             # Read Instagram data
-            instagram_file = os.path.join(settings.DATA_DIR, settings.INSTAGRAM_FILE)
-            instagram_df = pd.read_csv(instagram_file)
+            instagram_df = self._read_source(settings.INSTAGRAM_FILE, InstagramPost)
             logger.info(f"Extracted {len(instagram_df)} Instagram posts")
             
             return students_df, instagram_df
@@ -40,76 +89,211 @@ class SocialFITETL:
             logger.error(f"Error extracting data: {e}")
             raise
     
-    def transform_students(self, students_df: pd.DataFrame) -> List[Student]:
-        """Transform students data into Pydantic models."""
+    def source_files(self, file_name: str) -> List[str]:
+        """Input files of a source setting (file, glob or partition directory) that still need loading."""
+        paths = resolve_source_files(settings.DATA_DIR, file_name)
+        if self.ingest_ledger is not None:
+            paths = self.ingest_ledger.pending(paths)
+        return paths
+    
+    def mark_ingested(self, paths: List[str]):
+        """Record input files as loaded so later runs skip them."""
+        if self.ingest_ledger is not None and paths:
+            self.ingest_ledger.mark(paths)
+            logger.info(f"Recorded {len(paths)} ingested input file(s)")
+    
+    def _read_source(self, file_name: str, model: Type[BaseModel]) -> pd.DataFrame:
+        """Read every pending file of a source in parallel and concatenate them."""
+        paths = self.source_files(file_name)
+        self.extracted_files.extend(paths)
+        return self._read_files(paths, model)
+    
+    def _read_files(self, paths: List[str], model: Type[BaseModel]) -> pd.DataFrame:
+        if len(paths) > 1:
+            logger.info(f"Reading {len(paths)} {model.__name__} files")
+        if not paths:
+            aliases = [field.alias or name for name, field in model.model_fields.items()]
+            return pd.DataFrame(columns=aliases)
+        return read_many(paths, lambda path: self._read_file(path, model), settings.READ_WORKERS)
+    
+    def _read_file(self, path: str, model: Type[BaseModel]) -> pd.DataFrame:
+        """Read one CSV with the model's declared schema, through the input cache when enabled."""
+        engine = settings.CSV_ENGINE
+        if self.input_cache is not None:
+            variant = f"{model.__name__}:{engine}:{csv_schema(model)}"
+            df = self.input_cache.load(path, lambda source: read_csv_typed(source, model, engine), variant)
+        else:
+            df = read_csv_typed(path, model, engine)
+        return tag_origin(df, path)
+    
+    def extract_chunks(self, file_name: str, model: Type[BaseModel], chunk_size: int = None) -> Iterator[pd.DataFrame]:
+        """Stream the pending files of a source from ``settings.DATA_DIR`` in chunks of ``chunk_size`` rows."""
+        for path in self.source_files(file_name):
+            yield from self._read_chunks(path, model, chunk_size)
+    
+    def _read_chunks(self, path: str, model: Type[BaseModel], chunk_size: int = None) -> Iterator[pd.DataFrame]:
+        chunk_size = chunk_size or settings.EXTRACT_CHUNK_SIZE
+        with pd.read_csv(path, chunksize=chunk_size, **csv_schema(model, numeric=False)) as reader:
+            for chunk in reader:
+                yield tag_origin(chunk, path)
+    
+    def _source_chunks(self, file_name: str, model: Type[BaseModel]) -> Iterator[tuple]:
+        """``(path, chunk)`` for every chunk of every pending file, then ``(path, None)`` at the end of each file."""
+        for path in self.source_files(file_name):
+            for chunk in self._read_chunks(path, model):
+                yield path, chunk
+            yield path, None
+    
+    def _stream_source(self, kind: str, file_name: str, model: Type[BaseModel], transform, load) -> bool:
+        """Extract, transform and load one source chunk by chunk as a pipeline of bounded stages.
+        
+        Extraction and transformation run on their own threads, at most
+        ``settings.EXTRACT_BUFFER`` / ``settings.TRANSFORM_BUFFER`` chunks ahead of
+        the loader, so a slow database throttles the readers and memory stays flat.
+        Each input file is recorded as ingested once all of its chunks loaded.
+        """
+        chunks = prefetch(self._source_chunks(file_name, model), settings.EXTRACT_BUFFER, f"extract-{kind}")
+        batches = prefetch(
+            ((path, None if chunk is None else (len(chunk), transform(chunk))) for path, chunk in chunks),
+            settings.TRANSFORM_BUFFER, f"transform-{kind}"
+        )
+        
+        rows = loaded = number = 0
+        failed_files = set()
+        for path, item in batches:
+            if item is None:
+                if path not in failed_files:
+                    self.mark_ingested([path])
+                continue
+            chunk_rows, batch = item
+            number += 1
+            rows += chunk_rows
+            if len(batch) == 0:
+                continue
+            if load(batch.frame):
+                loaded += len(batch)
+            else:
+                logger.error(f"Failed to load {kind} chunk {number} ({os.path.basename(path)})")
+                failed_files.add(path)
+        logger.info(f"Streamed {rows} {kind} rows, loaded {loaded}")
+        return not failed_files
+    
+    def run_streaming_load(self) -> bool:
+        """Extract, transform and load both sources as a chunked generator pipeline."""
         try:
-            students = []
-            
-            # Clean and transform data
-            students_df['Data de Nascimento'] = pd.to_datetime(students_df['Data de Nascimento'])
-            students_df['Data Início Plano'] = pd.to_datetime(students_df['Data Início Plano'])
-            
-            # Convert boolean columns
-            students_df['Gympass'] = students_df['Gympass'].apply(lambda x: str(x).strip().lower() == 'true')
-            students_df['Plano Ativo'] = students_df['Plano Ativo'].apply(lambda x: str(x).strip().lower() == 'true')
+            self.db_manager.create_tables()
             
-            # Convert to Pydantic models
-            for _, row in students_df.iterrows():
-                try:
-                    student = Student(**row.to_dict())
-                    students.append(student)
-                except Exception as e:
-                    logger.warning(f"Error processing student row: {e}")
-                    continue
+            # Existing natural keys are fetched once and reused across chunks
+            with self.db_manager.cached_keys():
+                return self._run_branches(
+                    lambda: self._stream_source(
+                        'student', settings.STUDENTS_FILE, Student, self.transform_students_columnar, self.load_students
+                    ),
+                    lambda: self._stream_source(
+                        'Instagram post', settings.INSTAGRAM_FILE, InstagramPost,
+                        self.transform_instagram_columnar, self.load_instagram_posts
+                    )
+                )
             
-            logger.info(f"Transformed {len(students)} student records")
-            return students
+        except Exception as e:
+            logger.error(f"Error in streaming load: {e}")
+            return False
+    
+    def _run_source(self, kind: str, file_name: str, model: Type[BaseModel], transform, load) -> bool:
+        """Extract, transform and load one whole source; its files are recorded as ingested once loaded."""
+        paths = self.source_files(file_name)
+        df = self._read_files(paths, model)
+        logger.info(f"Extracted {len(df)} {kind} records")
+        if not load(transform(df).frame):
+            logger.error(f"Failed to load {kind} records")
+            return False
+        self.mark_ingested(paths)
+        return True
+    
+    def _run_branches(self, *branches: Callable[[], bool]) -> bool:
+        """Run independent source branches concurrently (``settings.PARALLEL_SOURCES``) and join them.
+        
+        Each branch loads as soon as its own transform is done, so one source is
+        written while the other is still being parsed.
+        """
+        if not settings.PARALLEL_SOURCES:
+            return all([branch() for branch in branches])
+        with ThreadPoolExecutor(max_workers=len(branches), thread_name_prefix="source") as executor:
+            futures = [executor.submit(branch) for branch in branches]
+            return all([future.result() for future in futures])
+    
+    def transform_students_columnar(self, students_df: pd.DataFrame) -> ColumnarBatch:
+        """Validate and coerce students data column by column into a typed batch."""
+        try:
+            batch = self.sharder.transform(students_df, transform_students_frame)
+            self._log_rejections('student', students_df, batch)
+            logger.info(f"Transformed {len(batch)} student records")
+            return batch
             
         except Exception as e:
             logger.error(f"Error transforming students data: {e}")
             raise
     
-    def transform_instagram(self, instagram_df: pd.DataFrame) -> List[InstagramPost]:
-        """Transform Instagram data into Pydantic models."""
+    def transform_students(self, students_df: pd.DataFrame) -> List[Student]:
+        """Transform students data into Pydantic models."""
+        return self.transform_students_columnar(students_df).to_models()
+    
+    def _log_rejections(self, kind: str, raw_df: pd.DataFrame, batch: ColumnarBatch):
+        """Count (and quarantine) the rows rejected by a columnar transform and log one aggregated warning."""
+        if batch.rejected_count:
+            self.rejections.add(kind, batch.error_categories())
+            if self.quarantine is not None:
+                self.quarantine.write(kind, raw_df, batch)
+            logger.warning(f"Rejected {batch.rejected_count} {kind} rows, invalid values per field: {batch.error_summary()}")
+        if batch.coerced:
+            logger.warning(f"Defaulted unparseable {kind} values to 0 per field: {batch.coerced}")
+    
+    def transform_instagram_columnar(self, instagram_df: pd.DataFrame) -> ColumnarBatch:
+        """Validate and coerce Instagram data column by column into a typed batch with engagement_rate."""
         try:
-            posts = []
-            
-            # Clean and transform data
-            instagram_df['Data'] = pd.to_datetime(instagram_df['Data'])
-            
-            # Convert numeric columns
-            numeric_columns = ['Likes', 'Comentários', 'Salvamentos', 'Alcance', 'Visitas ao Perfil', 'Novos Seguidores']
-            for col in numeric_columns:
-                instagram_df[col] = pd.to_numeric(instagram_df[col], errors='coerce')
-                instagram_df[col] = instagram_df[col].fillna(0).astype(int)
-            
-            # Convert to Pydantic models
-            for _, row in instagram_df.iterrows():
-                try:
-                    post = InstagramPost(**row.to_dict())
-                    posts.append(post)
-                except Exception as e:
-                    logger.warning(f"Error processing Instagram post row: {e}")
-                    continue
-            
-            logger.info(f"Transformed {len(posts)} Instagram posts")
-            return posts
+            batch = self.sharder.transform(instagram_df, transform_instagram_frame)
+            self._log_rejections('Instagram post', instagram_df, batch)
+            logger.info(f"Transformed {len(batch)} Instagram posts")
+            return batch
             
         except Exception as e:
             logger.error(f"Error transforming Instagram data: {e}")
             raise
     
-    def load_data(self, students: List[Student], posts: List[InstagramPost]) -> bool:
-        """Load transformed data into database."""
+    def transform_instagram(self, instagram_df: pd.DataFrame) -> List[InstagramPost]:
+        """Transform Instagram data into Pydantic models."""
+        return self.transform_instagram_columnar(instagram_df).to_models()
+    
+    def load_students(self, students: Union[List[Student], pd.DataFrame]) -> bool:
+        """Load students with the configured ``settings.LOAD_STRATEGY``."""
+        if settings.LOAD_STRATEGY == "copy" and self.db_manager.bulk_loader is not None:
+            # Stream through COPY into a staging table, merged with ON CONFLICT
+            return self.db_manager.copy_students(students)
+        if settings.LOAD_STRATEGY in ("upsert", "copy"):
+            # One idempotent write per batch on the natural key (also the COPY fallback without DATABASE_URL)
+            return self.db_manager.upsert_students(students)
+        return self.db_manager.insert_students(students)
+    
+    def load_instagram_posts(self, posts: Union[List[InstagramPost], pd.DataFrame]) -> bool:
+        """Load Instagram posts with the configured ``settings.LOAD_STRATEGY``."""
+        if settings.LOAD_STRATEGY == "copy" and self.db_manager.bulk_loader is not None:
+            return self.db_manager.copy_instagram_posts(posts)
+        if settings.LOAD_STRATEGY in ("upsert", "copy"):
+            return self.db_manager.upsert_instagram_posts(posts)
+        return self.db_manager.insert_instagram_posts(posts)
+    
+    def load_data(self, students: Union[List[Student], pd.DataFrame],
+                  posts: Union[List[InstagramPost], pd.DataFrame]) -> bool:
+        """Load transformed data (models or typed column batches) into database."""
         try:
             # Create tables if they don't exist
             self.db_manager.create_tables()
             
             # Load students data
-            students_success = self.db_manager.insert_students(students)
+            students_success = self.load_students(students)
             
             # Load Instagram posts data
-            posts_success = self.db_manager.insert_instagram_posts(posts)
+            posts_success = self.load_instagram_posts(posts)
             
             return students_success and posts_success
             
@@ -121,8 +305,9 @@ class SocialFITETL:
         """Generate comprehensive analytics."""
         try:
             # Retrieve data from database
-            students_df = self.db_manager.get_students()
-            instagram_df = self.db_manager.get_instagram_posts()
+            # Only the columns the analyses use, read from the local replicas (REPLICA_ENABLED) synced with the new rows
+            students_df = self.db_manager.get_students(columns=self.analytics_engine.STUDENT_COLUMNS, local=True)
+            instagram_df = self.db_manager.get_instagram_posts(columns=self.analytics_engine.INSTAGRAM_COLUMNS, local=True)
             
             if students_df.empty or instagram_df.empty:
                 logger.warning("No data available for analytics")
@@ -160,33 +345,63 @@ class SocialFITETL:
             logger.error(f"Error generating analytics: {e}")
             return {}
     
-    def run_full_pipeline(self) -> bool:
-        """Run the complete ETL pipeline."""
+    def _finish_run(self, success: bool) -> PipelineResult:
+        """Close the run's quarantine and summarize the rows rejected during the run."""
+        quarantine_path = None
+        if self.quarantine is not None:
+            self.quarantine.close()
+            self.quarantine.log_summary()
+            quarantine_path = self.quarantine.summary()['quarantine_path']
+        return PipelineResult(success, **self.rejections.summary(), quarantine_path=quarantine_path)
+    
+    def run_full_pipeline(self) -> PipelineResult:
+        """Run the complete ETL pipeline.
+        
+        Returns a ``PipelineResult``, truthy on success, with the rejected row
+        counts and quarantine file of the run.
+        """
+        success = False
         try:
             logger.info("Starting Social FIT ETL pipeline")
-            
-            # Extract
-            students_df, instagram_df = self.extract_data()
-            
-            # Transform
-            students = self.transform_students(students_df)
-            posts = self.transform_instagram(instagram_df)
-            
-            # Load
-            load_success = self.load_data(students, posts)
-            
+            if self.quarantine is not None:
+                self.quarantine.close()
+            self.rejections = RejectionTally()
+            self.quarantine = self._new_quarantine()
+            
+            if settings.STREAMING_EXTRACT:
+                # Bounded memory: extract, transform and load chunk by chunk
+                load_success = self.run_streaming_load()
+            else:
+                self.db_manager.create_tables()
+                
+                # Extract, transform and load each source on its own branch
+                # (both stay columnar all the way to the loader)
+                load_success = self._run_branches(
+                    lambda: self._run_source(
+                        'student', settings.STUDENTS_FILE, Student, self.transform_students_columnar, self.load_students
+                    ),
+                    lambda: self._run_source(
+                        'Instagram post', settings.INSTAGRAM_FILE, InstagramPost,
+                        self.transform_instagram_columnar, self.load_instagram_posts
+                    )
+                )
+            
+            # Both branches are joined before analytics read the tables back
             if load_success:
                 # Generate analytics
                 analytics = self.generate_analytics()
                 logger.info("ETL pipeline completed successfully")
-                return True
+                success = True
             else:
                 logger.error("ETL pipeline failed at loading stage")
-                return False
                 
         except Exception as e:
             logger.error(f"ETL pipeline failed: {e}")
-            return False
+        
+        finally:
+            self.sharder.shutdown()
+        
+        return self._finish_run(success)
     
     def run_incremental_update(self) -> bool:
         """Run incremental update of the pipeline."""
@@ -197,8 +412,8 @@ class SocialFITETL:
             students_df, instagram_df = self.extract_data()
             
             # Get existing data to identify new records
-            existing_students = self.db_manager.get_students()
-            existing_posts = self.db_manager.get_instagram_posts()
+            existing_students = self.db_manager.get_students(columns=['id'])
+            existing_posts = self.db_manager.get_instagram_posts(columns=['id', 'post_date'])
             
             # Filter new records (simplified logic - in production would use timestamps)
             if not existing_students.empty:
@@ -213,12 +428,12 @@ class SocialFITETL:
             
             # Transform and load new data
             if not students_df.empty:
-                new_students = self.transform_students(students_df)
-                self.db_manager.insert_students(new_students)
+                new_students = self.transform_students_columnar(students_df).frame
+                self.load_students(new_students)
             
             if not instagram_df.empty:
-                new_posts = self.transform_instagram(instagram_df)
-                self.db_manager.insert_instagram_posts(new_posts)
+                new_posts = self.transform_instagram_columnar(instagram_df).frame
+                self.load_instagram_posts(new_posts)
             
             # Regenerate analytics
             self.generate_analytics()
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict
+
+import pandas as pd
+from loguru import logger
+
+
+class InputCache:
+    """Parquet cache of parsed input files, keyed by file size, mtime and content hash.
+
+    A manifest maps each source file to its last seen ``(size, mtime)`` and
+    content hash, so an untouched file is served without re-reading it. A
+    file whose stat changed is re-hashed: identical content is still a hit,
+    anything else is re-parsed and written back. Entries are content-addressed
+    and evicted least-recently-used once the cache exceeds ``max_bytes``.
+    Loads may run from several threads: the manifest is guarded by a lock and
+    files are replaced atomically from unique temp files.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._manifest_path = os.path.join(cache_dir, self.MANIFEST)
+        self._manifest = self._read_manifest()
+        self._lock = threading.Lock()
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self._manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"sources": {}, "entries": {}}
+
+    def _write_manifest(self) -> None:
+        """Persist the manifest (caller holds the lock)."""
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_dir,
+                                         suffix=".tmp", delete=False) as f:
+            json.dump(self._manifest, f)
+        os.replace(f.name, self._manifest_path)
+
+    @staticmethod
+    def content_hash(path: str, block_size: int = 1 << 20) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def _key(self, source: str, stat: os.stat_result, variant: str) -> str:
+        """Cache key of ``source``: trusted from the manifest while size and mtime match, else re-hashed."""
+        with self._lock:
+            known = self._manifest["sources"].get(f"{variant}:{source}")
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["key"]
+        variant_hash = hashlib.blake2b(variant.encode(), digest_size=4).hexdigest()
+        return f"{self.content_hash(source)}-{variant_hash}"
+
+    def load(self, source: str, reader: Callable[[str], pd.DataFrame], variant: str = "") -> pd.DataFrame:
+        """Return the parsed DataFrame for ``source``, from cache when its content is unchanged.
+
+        ``variant`` identifies the reader configuration (schema, engine...); a different
+        variant never reuses another one's entries.
+        """
+        stat = os.stat(source)
+        key = self._key(source, stat, variant)
+        entry_path = self._entry_path(key)
+        with self._lock:
+            hit = key in self._manifest["entries"] and os.path.exists(entry_path)
+        if hit:
+            df = pd.read_parquet(entry_path)
+            logger.info(f"⚡ Loaded {os.path.basename(source)} from input cache ({len(df)} rows)")
+        else:
+            df = reader(source)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+            try:
+                df.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, entry_path)
+            except Exception as e:
+                logger.warning(f"Could not cache {os.path.basename(source)}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return df
+
+        with self._lock:
+            if not hit:
+                self._manifest["entries"][key] = {"bytes": os.path.getsize(entry_path)}
+            elif key not in self._manifest["entries"]:
+                # Evicted by a concurrent load while this one was reading it
+                return df
+            self._manifest["sources"][f"{variant}:{source}"] = {
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "key": key
+            }
+            self._manifest["entries"][key]["last_used"] = time.time()
+            self._evict()
+            self._write_manifest()
+        return df
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in ``max_bytes`` (caller holds the lock)."""
+        entries = self._manifest["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]["bytes"]
+            del entries[key]
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            self._manifest["sources"] = {
+                source: known for source, known in self._manifest["sources"].items() if known["key"] != key
+            }
+            logger.debug(f"Evicted input cache entry {key}")
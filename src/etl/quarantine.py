@@ -0,0 +1,119 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from .columnar import ColumnarBatch
+from .sources import LINE_COLUMN, SOURCE_FILE_COLUMN
+
+
+class RejectionTally:
+    """Counts rejected rows per source and per error category over a run, whether or not
+    they are also written to a quarantine file. Safe to update from concurrent branches."""
+
+    def __init__(self):
+        self.rejected: Dict[str, int] = {}
+        self.by_error: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, source: str, categories: pd.Series) -> None:
+        """Count the rejected rows of one batch, given their error categories."""
+        if categories.empty:
+            return
+        counts = categories.value_counts()
+        with self._lock:
+            self.rejected[source] = self.rejected.get(source, 0) + len(categories)
+            for category, count in counts.items():
+                key = f"{source}: {category}"
+                self.by_error[key] = self.by_error.get(key, 0) + int(count)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {'rejected_rows': dict(self.rejected), 'rejected_by_error': dict(self.by_error)}
+
+
+class QuarantineSink:
+    """Appends rejected rows to a quarantine file (CSV or Parquet) and tallies them by error category.
+
+    Each rejected row is written once with its source, input file, line number,
+    error category (the invalid fields, e.g. ``gender+birth_date``), the full
+    error message and the raw row as JSON. The file is created on the first
+    rejection and appended to by every later chunk until ``close``.
+    """
+
+    COLUMNS = ['source', 'source_file', 'line', 'error_category', 'error', 'raw_row']
+
+    def __init__(self, path: str, file_format: str = "csv"):
+        self.path = path
+        self.file_format = file_format
+        self.tally = RejectionTally()
+        self._lock = threading.Lock()
+        self._parquet_writer: Optional[pq.ParquetWriter] = None
+        self._created = False
+
+    def write(self, source: str, raw: pd.DataFrame, batch: ColumnarBatch) -> int:
+        """Quarantine the rows of ``raw`` rejected by ``batch``; returns how many were written."""
+        invalid = batch.invalid_mask
+        if not invalid.any():
+            return 0
+
+        rejected = raw.loc[invalid[invalid].index]
+        categories = batch.error_categories()
+
+        raw_columns = [column for column in rejected.columns if column not in (SOURCE_FILE_COLUMN, LINE_COLUMN)]
+        raw_rows = rejected[raw_columns].to_json(orient='records', lines=True, date_format='iso', force_ascii=False)
+        if SOURCE_FILE_COLUMN in rejected.columns:
+            source_files = rejected[SOURCE_FILE_COLUMN].astype(str)
+            lines = rejected[LINE_COLUMN].astype('Int64')
+        else:
+            source_files = pd.Series('', index=rejected.index)
+            lines = pd.Series(pd.NA, index=rejected.index, dtype='Int64')
+
+        frame = pd.DataFrame({
+            'source': source,
+            'source_file': source_files,
+            'line': lines,
+            'error_category': categories,
+            'error': batch.reasons().loc[rejected.index],
+            'raw_row': raw_rows.splitlines()
+        }, columns=self.COLUMNS)
+
+        with self._lock:
+            self._append(frame)
+        self.tally.add(source, categories)
+        return len(frame)
+
+    def _append(self, frame: pd.DataFrame) -> None:
+        if not self._created:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        if self.file_format == "parquet":
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        else:
+            frame.to_csv(self.path, mode='a' if self._created else 'w', header=not self._created, index=False)
+        self._created = True
+
+    def summary(self) -> Dict[str, Any]:
+        """Rejected row counts per source and per error category, and the quarantine file."""
+        return {**self.tally.summary(), 'quarantine_path': self.path if self._created else None}
+
+    def log_summary(self) -> None:
+        if self.tally.rejected:
+            logger.warning(
+                f"🚧 Quarantined {sum(self.tally.rejected.values())} rejected rows to {self.path}, "
+                f"by error: {self.tally.by_error}"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+                self._parquet_writer = None
@@ -0,0 +1,52 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Type
+
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel
+
+from src.models import Student, InstagramPost
+
+# Low-cardinality text fields stored as pandas categoricals
+CATEGORICAL_FIELDS = {
+    Student: ['gender', 'neighborhood', 'plan_type'],
+    InstagramPost: ['main_hashtag'],
+}
+
+
+def csv_schema(model: Type[BaseModel], numeric: bool = True) -> Dict[str, Any]:
+    """``pd.read_csv`` keyword arguments (dtype, parse_dates) derived from a model's aliases and types.
+
+    ``numeric=False`` leaves numeric columns to inference, for readers that cannot
+    fall back when a value does not parse (chunked reads).
+    """
+    dtype = {}
+    parse_dates: List[str] = []
+    categorical = CATEGORICAL_FIELDS.get(model, [])
+    for name, field in model.model_fields.items():
+        column = field.alias or name
+        annotation = field.annotation
+        if name in categorical or (isinstance(annotation, type) and issubclass(annotation, Enum)):
+            dtype[column] = 'category'
+        elif annotation is datetime:
+            parse_dates.append(column)
+        elif numeric and annotation is float:
+            dtype[column] = 'float64'
+        elif numeric and annotation is int:
+            dtype[column] = 'Int64'
+    return {'dtype': dtype, 'parse_dates': parse_dates}
+
+
+def read_csv_typed(path: str, model: Type[BaseModel], engine: str = 'c', **kwargs) -> pd.DataFrame:
+    """Read a CSV with the declared schema for ``model``.
+
+    Falls back to plain inference when the file does not fit the schema (e.g. text in a
+    numeric column), so the columnar transform can still reject the offending rows.
+    """
+    options = csv_schema(model)
+    try:
+        return pd.read_csv(path, engine=engine, **options, **kwargs)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"{path} does not match the declared {model.__name__} schema ({e}), reading untyped")
+        return pd.read_csv(path, **kwargs)
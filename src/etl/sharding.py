@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from .columnar import ColumnarBatch
+
+FrameTransform = Callable[[pd.DataFrame], ColumnarBatch]
+
+# Arrow IPC files are memory-mapped by the workers; /dev/shm keeps them in RAM
+SHARD_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _write_ipc(df: pd.DataFrame, path: str) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_ipc(path: str) -> pd.DataFrame:
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _transform_shard(transform: FrameTransform, in_path: str, out_path: str) -> Tuple[Dict[str, str], Dict[str, int], type]:
+    """Worker side: read a shard, transform it and write the valid rows and error masks back."""
+    batch = transform(_read_ipc(in_path))
+    _write_ipc(batch.frame, out_path + ".frame")
+    _write_ipc(batch.errors, out_path + ".errors")
+    return batch.messages, batch.coerced, batch.model
+
+
+def merge_batches(batches: List[ColumnarBatch]) -> ColumnarBatch:
+    """Concatenate shard batches in input order, summing coerced counts."""
+    messages: Dict[str, str] = {}
+    coerced: Dict[str, int] = {}
+    for batch in batches:
+        for field, message in batch.messages.items():
+            messages.setdefault(field, message)
+        for field, count in batch.coerced.items():
+            coerced[field] = coerced.get(field, 0) + count
+    return ColumnarBatch(
+        pd.concat([batch.frame for batch in batches]),
+        pd.concat([batch.errors for batch in batches]),
+        messages,
+        batches[0].model,
+        coerced
+    )
+
+
+class ShardedTransformer:
+    """Runs a columnar transform over row shards on a process pool.
+
+    Shards travel to and from the workers as memory-mapped Arrow IPC files
+    instead of pickled DataFrames, and the pool is started lazily and kept
+    until ``shutdown``. Inputs below ``min_rows``, ``workers <= 1``, a pool
+    that cannot start or a frame Arrow cannot encode fall back to the serial
+    transform. ``min_rows`` is compared with each frame handed to ``transform``:
+    the whole source in batch runs, but every chunk in streaming runs, so it
+    must not exceed ``EXTRACT_CHUNK_SIZE`` for streamed chunks to be sharded.
+    """
+
+    def __init__(self, workers: int, min_rows: int):
+        self.workers = workers
+        self.min_rows = min_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Both source branches may shard at once, only one of them may start the pool
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the ETL runs loader threads, which fork does not play well with
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def transform(self, df: pd.DataFrame, transform: FrameTransform) -> ColumnarBatch:
+        """Transform ``df`` with ``transform``, sharded across the pool when worthwhile."""
+        if self.workers <= 1 or len(df) < self.min_rows:
+            return transform(df)
+        try:
+            return self._transform_sharded(df, transform)
+        except (BrokenProcessPool, OSError, pa.ArrowException) as e:
+            # Includes frames Arrow cannot represent (e.g. object columns of mixed types)
+            logger.warning(f"Sharded transform unavailable ({e}), transforming serially")
+            self.shutdown()
+            return transform(df)
+
+    def _transform_sharded(self, df: pd.DataFrame, transform: FrameTransform) -> ColumnarBatch:
+        bounds = np.linspace(0, len(df), self.workers + 1, dtype=int)
+        with tempfile.TemporaryDirectory(prefix="socialfit-shards-", dir=SHARD_DIR) as shard_dir:
+            futures = []
+            for number, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+                in_path = os.path.join(shard_dir, f"in-{number}.arrow")
+                out_path = os.path.join(shard_dir, f"out-{number}")
+                _write_ipc(df.iloc[start:stop], in_path)
+                futures.append((out_path, self._pool().submit(_transform_shard, transform, in_path, out_path)))
+
+            # Results are collected in submission order, so rows and errors keep the input order
+            batches = []
+            for out_path, future in futures:
+                messages, coerced, model = future.result()
+                batches.append(ColumnarBatch(
+                    _read_ipc(out_path + ".frame"), _read_ipc(out_path + ".errors"), messages, model, coerced
+                ))
+        logger.info(f"Transformed {len(df)} rows in {len(batches)} shards")
+        return merge_batches(batches)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
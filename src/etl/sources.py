@@ -0,0 +1,126 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Input files a source directory is scanned for; compressed exports are decompressed
+# incrementally by pandas while parsing (zstd needs the ``zstandard`` package)
+INPUT_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst')
+
+# Origin columns added to every extracted row, used to locate rejected rows
+SOURCE_FILE_COLUMN = '_source_file'
+LINE_COLUMN = '_line'
+
+
+def resolve_source_files(data_dir: str, spec: str) -> List[str]:
+    """Expand a source setting into the input files it names.
+
+    ``spec`` is a file name, a glob pattern (``alunos_2024-*.csv.gz``) or a directory
+    of partitions, all relative to ``data_dir``. Files are returned sorted so
+    monthly exports are read in order.
+    """
+    path = os.path.join(data_dir, spec)
+    if os.path.isdir(path):
+        pattern = os.path.join(path, '**', '*')
+        return sorted(
+            p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p) and p.endswith(INPUT_SUFFIXES)
+        )
+    if glob.has_magic(spec):
+        return sorted(p for p in glob.glob(path, recursive=True) if os.path.isfile(p))
+    return [path]
+
+
+def tag_origin(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    """Add the input file and line number of each row (the header is line 1; assumes
+    one physical line per record and a default RangeIndex, which chunked reads continue)."""
+    return df.assign(**{
+        SOURCE_FILE_COLUMN: pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), [path]),
+        LINE_COLUMN: (df.index.to_numpy() + 2).astype('int64')
+    })
+
+
+def align_categoricals(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Give every categorical column the same category dictionary across frames,
+    so concatenation keeps it categorical instead of falling back to object."""
+    if len(frames) < 2:
+        return frames
+    columns = [
+        column for column in frames[0].columns
+        if all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    for column in columns:
+        categories = pd.Index([])
+        for frame in frames:
+            categories = categories.union(frame[column].cat.categories, sort=False)
+        frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return frames
+
+
+def read_many(paths: List[str], read: Callable[[str], pd.DataFrame], workers: int = 1) -> pd.DataFrame:
+    """Read several files on a thread pool and concatenate them in path order."""
+    if not paths:
+        return pd.DataFrame()
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths)), thread_name_prefix="extract") as executor:
+            frames = list(executor.map(read, paths))
+    else:
+        frames = [read(path) for path in paths]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(align_categoricals(frames), ignore_index=True)
+
+
+class IngestLedger:
+    """Record of input files already loaded, so reruns only process new or changed files.
+
+    A file counts as ingested while its size and mtime match what was recorded
+    when its load succeeded. Branches running concurrently may share one ledger,
+    so updates are serialized by a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._files: Dict[str, Dict[str, int]] = json.load(f)
+        except (OSError, ValueError):
+            self._files = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: str) -> Dict[str, int]:
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_ingested(self, path: str) -> bool:
+        with self._lock:
+            known = self._files.get(os.path.abspath(path))
+        return known == self._signature(path)
+
+    def pending(self, paths: List[str]) -> List[str]:
+        """The subset of ``paths`` not ingested yet."""
+        new_paths = [path for path in paths if not self.is_ingested(path)]
+        skipped = len(paths) - len(new_paths)
+        if skipped:
+            logger.info(f"Skipping {skipped} already ingested file(s)")
+        return new_paths
+
+    def mark(self, paths: List[str]) -> None:
+        """Record ``paths`` as ingested and persist the ledger."""
+        signatures = {os.path.abspath(path): self._signature(path) for path in paths}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._files.update(signatures)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory or ".",
+                                             suffix=".tmp", delete=False) as f:
+                json.dump(self._files, f, indent=2)
+            os.replace(f.name, self.path)
@@ -0,0 +1,61 @@
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+def prefetch(items: Iterable[T], depth: int, name: str = "stage") -> Iterator[T]:
+    """Iterate ``items`` on a background thread, running at most ``depth`` items ahead of the consumer.
+
+    The bounded buffer gives backpressure: when the consumer falls behind, the
+    producer blocks instead of piling items up in memory. Chaining calls builds
+    a pipeline with one thread and one buffer per stage. Errors raised by the
+    producer are re-raised in the consumer, and closing the returned iterator
+    stops the producer. ``depth <= 0`` iterates in the caller's thread.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name=name, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
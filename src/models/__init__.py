@@ -5,13 +5,21 @@ Data Models Module
 Pydantic models for Social FIT data structures.
 """
 
-from .models import Student, InstagramPost, StudentAnalytics, InstagramAnalytics, CrossPlatformAnalytics, ColumnMapper
+from .models import Student, InstagramPost, Gender, PlanType, StudentAnalytics, InstagramAnalytics, CrossPlatformAnalytics, ColumnMapper
+from .models import validate_records, validate_students, validate_instagram_posts
+from .compact import CompactRecords
 
 __all__ = [
     'Student', 
     'InstagramPost', 
+    'Gender',
+    'PlanType',
     'StudentAnalytics', 
     'InstagramAnalytics', 
     'CrossPlatformAnalytics',
-    'ColumnMapper'
+    'ColumnMapper',
+    'validate_records',
+    'validate_students',
+    'validate_instagram_posts',
+    'CompactRecords'
 ] 
\ No newline at end of file
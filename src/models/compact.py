@@ -0,0 +1,133 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Sequence, Type
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from .models import validate_records
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _field_kind(annotation: Any) -> str:
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return 'enum'
+    if annotation is datetime:
+        return 'datetime'
+    if annotation is bool:
+        return 'bool'
+    if annotation is int:
+        return 'int'
+    if annotation is float:
+        return 'float'
+    return 'str'
+
+
+class CompactRecords:
+    """Struct-of-arrays form of a list of models, one NumPy array per field.
+
+    Enums are stored as int8 codes, dates as int32 day ordinals (int64 nanoseconds
+    when a value carries a time of day), integers in the narrowest of int32/int64
+    that fits and strings dictionary-encoded as int32 codes. Converting back with
+    ``to_models`` or ``to_frame`` gives the original values.
+    """
+
+    def __init__(self, model: Type[BaseModel], arrays: Dict[str, np.ndarray],
+                 dictionaries: Dict[str, np.ndarray]):
+        self.model = model
+        self.arrays = arrays
+        self.dictionaries = dictionaries
+        self._kinds = {name: _field_kind(field.annotation) for name, field in model.model_fields.items()}
+
+    def __len__(self) -> int:
+        return len(next(iter(self.arrays.values()))) if self.arrays else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays and string dictionaries."""
+        total = sum(array.nbytes for array in self.arrays.values())
+        for values in self.dictionaries.values():
+            total += values.nbytes + sum(len(value) for value in values)
+        return total
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, model: Type[BaseModel]) -> 'CompactRecords':
+        """Encode a typed frame with model field names as columns (e.g. ``ColumnarBatch.frame``)."""
+        arrays: Dict[str, np.ndarray] = {}
+        dictionaries: Dict[str, np.ndarray] = {}
+        for name, field in model.model_fields.items():
+            column = frame[name]
+            kind = _field_kind(field.annotation)
+            if kind == 'enum':
+                values = [member.value for member in field.annotation]
+                codes = pd.Categorical(column, categories=values).codes
+                if (codes < 0).any():
+                    raise ValueError(f"{name} has values outside {values}")
+                arrays[name] = codes.astype(np.int8)
+            elif kind == 'datetime':
+                stamps = pd.to_datetime(column).to_numpy(dtype='datetime64[ns]')
+                days = stamps.astype('datetime64[D]')
+                if (days == stamps).all():
+                    arrays[name] = (days - _EPOCH).astype(np.int32)
+                else:
+                    arrays[name] = stamps.view(np.int64)
+            elif kind == 'bool':
+                arrays[name] = column.to_numpy(dtype=bool)
+            elif kind == 'int':
+                values = column.to_numpy(dtype=np.int64)
+                fits = not len(values) or np.iinfo(np.int32).min <= values.min() <= values.max() <= np.iinfo(np.int32).max
+                arrays[name] = values.astype(np.int32) if fits else values
+            elif kind == 'float':
+                arrays[name] = column.to_numpy(dtype=np.float64)
+            else:
+                codes, uniques = pd.factorize(column.astype(str))
+                arrays[name] = codes.astype(np.int32)
+                dictionaries[name] = np.asarray(uniques, dtype=object)
+        return cls(model, arrays, dictionaries)
+
+    @classmethod
+    def from_models(cls, models: Sequence[BaseModel], model: Type[BaseModel] = None) -> 'CompactRecords':
+        """Encode a list of Pydantic models."""
+        model = model or type(models[0])
+        names = list(model.model_fields)
+        # Enum members hash by name, so they are encoded through their values
+        frame = pd.DataFrame({
+            name: [value.value if isinstance(value, Enum) else value for value in (getattr(record, name) for record in models)]
+            for name in names
+        }, columns=names)
+        return cls.from_frame(frame, model)
+
+    def column(self, name: str) -> np.ndarray:
+        """Decoded values of one field (enum values as their string values)."""
+        array = self.arrays[name]
+        kind = self._kinds[name]
+        if kind == 'enum':
+            values = np.array([member.value for member in self.model.model_fields[name].annotation], dtype=object)
+            return values[array]
+        if kind == 'datetime':
+            if array.dtype == np.int32:
+                return (_EPOCH + array.astype('timedelta64[D]')).astype('datetime64[ns]')
+            return array.view('datetime64[ns]')
+        if kind == 'str':
+            return self.dictionaries[name][array]
+        return array
+
+    def to_frame(self) -> pd.DataFrame:
+        """Decode into a typed frame with model field names, as produced by the columnar transforms."""
+        frame = pd.DataFrame({name: self.column(name) for name in self.arrays})
+        return frame.astype({name: 'int64' for name, kind in self._kinds.items() if kind == 'int'})
+
+    def to_models(self) -> List[BaseModel]:
+        """Decode into Pydantic models (constructed on the trusted path, values are already valid)."""
+        frame = self.to_frame()
+        for name, kind in self._kinds.items():
+            if kind == 'enum':
+                # An explicit object column, pandas would otherwise store str enums as plain strings
+                members = np.array(list(self.model.model_fields[name].annotation), dtype=object)
+                frame[name] = pd.Series(members[self.arrays[name]], index=frame.index, dtype=object)
+        return validate_records(self.model, frame.to_dict('records'), trusted=True)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        return iter(self.to_models())
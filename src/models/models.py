@@ -1,10 +1,15 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Type, TypeVar
 from enum import Enum
 import pandas as pd
 import re
+import threading
+import unicodedata
 import numpy as np
+from collections import OrderedDict
+from loguru import logger
 
 class Gender(str, Enum):
     MALE = "M"
@@ -15,63 +20,140 @@ class PlanType(str, Enum):
     QUARTERLY = "Trimestral"
     ANNUAL = "Anual"
 
+# Header keywords per field, in priority order: the first matching field wins unless
+# the sampled values rule it out. Headers are lower-cased and stripped of accents.
+_COLUMN_RULES = [
+    # Student-related patterns
+    ('id', [r'(?<![a-z])id(?![a-z])', 'codigo', 'numero']),
+    ('name', ['nome', 'name', 'aluno', 'student']),
+    ('gender', ['genero', 'sexo', 'gender']),
+    ('birth_date', ['nascimento', 'birth', 'data_nasc']),
+    ('address', ['endereco', 'address', 'rua']),
+    ('neighborhood', ['bairro', 'neighborhood']),
+    ('plan_type', ['plano', 'plan', 'tipo']),
+    ('gympass', ['gympass']),
+    ('total_value', ['total', 'valor_total']),
+    ('monthly_value', ['valor', 'price', 'mensal']),
+    ('plan_start_date', ['inicio', 'start', 'data_inicio']),
+    ('active_plan', ['ativo', 'active', 'status']),
+    # Instagram-related patterns
+    ('date', ['data', 'date', 'post_date']),
+    ('likes', ['like', 'curtida']),
+    ('comments', ['comentario', 'comment']),
+    ('saves', ['salvo', 'salvamento', 'save', 'bookmark']),
+    ('reach', ['alcance', 'reach', 'impression']),
+    ('profile_visits', ['visita', 'visit', 'perfil']),
+    ('new_followers', ['seguidor', 'follower', 'novo']),
+    ('main_hashtag', ['hashtag', 'tag']),
+]
+_FIELD_PRIORITY = [field for field, _ in _COLUMN_RULES]
+
+# One optional lookahead per field, so a single match reports every field whose keywords occur
+_COLUMN_MATCHER = re.compile(''.join(
+    f"(?:(?=.*?(?P<{field}>{'|'.join(keywords)})))?" for field, keywords in _COLUMN_RULES
+))
+
+# Kinds of sampled values each field accepts
+_FIELD_VALUE_KINDS = {
+    'id': {'integer'},
+    'birth_date': {'date'}, 'plan_start_date': {'date'}, 'date': {'date'},
+    'gympass': {'boolean'}, 'active_plan': {'boolean'},
+    'monthly_value': {'integer', 'number'}, 'total_value': {'integer', 'number'},
+    **{field: {'integer', 'number'} for field in ['likes', 'comments', 'saves', 'reach', 'profile_visits', 'new_followers']},
+    **{field: {'text'} for field in ['name', 'gender', 'address', 'neighborhood', 'plan_type', 'main_hashtag']},
+}
+
+_BOOLEAN_TOKENS = {'true', 'false', 'sim', 'nao', 'não', 'yes', 'no', 'ativo', 'inativo'}
+_INTEGER_PATTERN = re.compile(r'^[+-]?\d+$')
+_NUMBER_PATTERN = re.compile(r'^[+-]?(\d+([.,]\d*)?|[.,]\d+)([eE][+-]?\d+)?$')
+_DATE_PATTERN = re.compile(r'^(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}/\d{4})')
+
+_DATE_FIELDS = ['birth_date', 'date', 'plan_start_date']
+_COUNT_FIELDS = ['likes', 'comments', 'saves', 'reach', 'profile_visits', 'new_followers']
+_BOOLEAN_FIELDS = ['gympass', 'active_plan']
+_TRUE_TOKENS = {'true', 'sim', 'yes', '1', 'ativo'}
+_FALSE_TOKENS = {'false', 'nao', 'não', 'no', '0', 'inativo'}
+_GENDER_TOKENS = {
+    'M': 'M', 'MASCULINO': 'M', 'MALE': 'M',
+    'F': 'F', 'FEMININO': 'F', 'FEMALE': 'F',
+}
+
+def _normalize_header(column_name: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', str(column_name).lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+@lru_cache(maxsize=1024)
+def _header_candidates(column_name: str) -> tuple:
+    """Fields whose keywords occur in the header, in priority order."""
+    groups = _COLUMN_MATCHER.match(_normalize_header(column_name)).groupdict()
+    return tuple(field for field in _FIELD_PRIORITY if groups[field] is not None)
+
+def _value_kind(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return 'boolean'
+    if isinstance(value, (int, np.integer)):
+        return 'integer'
+    if isinstance(value, (float, np.floating)):
+        return 'integer' if float(value).is_integer() else 'number'
+    if isinstance(value, (datetime, pd.Timestamp, np.datetime64)):
+        return 'date'
+    text = str(value).strip()
+    if text.lower() in _BOOLEAN_TOKENS:
+        return 'boolean'
+    if _INTEGER_PATTERN.match(text):
+        return 'integer'
+    if _NUMBER_PATTERN.match(text):
+        return 'number'
+    if _DATE_PATTERN.match(text):
+        return 'date'
+    return 'text'
+
+def _sniff_kinds(sample_values: list) -> set:
+    """Value kinds shared by all samples; integers also count as numbers."""
+    kinds = {_value_kind(value) for value in sample_values}
+    if kinds == {'integer', 'number'}:
+        return {'number'}
+    return kinds
+
 class ColumnMapper:
     """Automatic column mapping utility for CSV files."""
     
+    # Mappings memoized by header signature (column names and dtypes)
+    MAPPING_CACHE_SIZE = 128
+    _mapping_cache: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+    _mapping_lock = threading.Lock()
+    
     @staticmethod
     def detect_column_type(column_name: str, sample_values: list) -> str:
-        """Detect the type of a column based on name and sample values."""
-        column_lower = column_name.lower()
-        
-        # Student-related patterns
-        if any(word in column_lower for word in ['id', 'codigo', 'numero']):
-            return 'id'
-        elif any(word in column_lower for word in ['nome', 'name', 'aluno', 'student']):
-            return 'name'
-        elif any(word in column_lower for word in ['genero', 'sexo', 'gender']):
-            return 'gender'
-        elif any(word in column_lower for word in ['nascimento', 'birth', 'data_nasc']):
-            return 'birth_date'
-        elif any(word in column_lower for word in ['endereco', 'address', 'rua']):
-            return 'address'
-        elif any(word in column_lower for word in ['bairro', 'neighborhood', 'bairro']):
-            return 'neighborhood'
-        elif any(word in column_lower for word in ['plano', 'plan', 'tipo']):
-            return 'plan_type'
-        elif any(word in column_lower for word in ['gympass']):
-            return 'gympass'
-        elif any(word in column_lower for word in ['valor', 'price', 'mensal']):
-            return 'monthly_value'
-        elif any(word in column_lower for word in ['total', 'valor_total']):
-            return 'total_value'
-        elif any(word in column_lower for word in ['inicio', 'start', 'data_inicio']):
-            return 'plan_start_date'
-        elif any(word in column_lower for word in ['ativo', 'active', 'status']):
-            return 'active_plan'
+        """Detect the type of a column based on name and sample values.
         
-        # Instagram-related patterns
-        elif any(word in column_lower for word in ['data', 'date', 'post_date']):
-            return 'date'
-        elif any(word in column_lower for word in ['like', 'curtida']):
-            return 'likes'
-        elif any(word in column_lower for word in ['comentario', 'comment']):
-            return 'comments'
-        elif any(word in column_lower for word in ['salvamento', 'save', 'bookmark']):
-            return 'saves'
-        elif any(word in column_lower for word in ['alcance', 'reach', 'impression']):
-            return 'reach'
-        elif any(word in column_lower for word in ['visita', 'visit', 'perfil']):
-            return 'profile_visits'
-        elif any(word in column_lower for word in ['seguidor', 'follower', 'novo']):
-            return 'new_followers'
-        elif any(word in column_lower for word in ['hashtag', 'tag']):
-            return 'main_hashtag'
+        The header picks the candidate fields; the first one whose expected value
+        kind matches every sample wins, falling back to the best header match.
+        """
+        candidates = _header_candidates(column_name)
+        if not candidates:
+            return 'unknown'
         
-        return 'unknown'
+        kinds = _sniff_kinds(sample_values)
+        if kinds and len(kinds) == 1:
+            for field in candidates:
+                if kinds <= _FIELD_VALUE_KINDS[field]:
+                    return field
+        return candidates[0]
     
     @staticmethod
     def create_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
-        """Create automatic column mapping for a DataFrame."""
+        """Create automatic column mapping for a DataFrame.
+        
+        Frames with the same header signature reuse the cached mapping.
+        """
+        signature = tuple((str(column), str(dtype)) for column, dtype in df.dtypes.items())
+        with ColumnMapper._mapping_lock:
+            cached = ColumnMapper._mapping_cache.get(signature)
+            if cached is not None:
+                ColumnMapper._mapping_cache.move_to_end(signature)
+                return dict(cached)
+        
         mapping = {}
         
         for column in df.columns:
@@ -82,41 +164,98 @@ class ColumnMapper:
             if detected_type != 'unknown':
                 mapping[column] = detected_type
         
-        return mapping
+        with ColumnMapper._mapping_lock:
+            ColumnMapper._mapping_cache[signature] = mapping
+            if len(ColumnMapper._mapping_cache) > ColumnMapper.MAPPING_CACHE_SIZE:
+                ColumnMapper._mapping_cache.popitem(last=False)
+        return dict(mapping)
     
     @staticmethod
-    def transform_dataframe(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
-        """Transform DataFrame using the column mapping."""
-        transformed_df = df.copy()
+    def _factorize_tokens(series: pd.Series, case) -> tuple[np.ndarray, np.ndarray]:
+        """Codes of ``series`` and the normalized token of each distinct value.
+        
+        Tokens are computed once per distinct value; missing values have code -1,
+        which picks the trailing empty token.
+        """
+        codes, uniques = pd.factorize(series)
+        tokens = np.array([case(str(value).strip()) for value in uniques] + [''], dtype=object)
+        return codes, tokens
+    
+    @staticmethod
+    def convert_columns(df: pd.DataFrame, mapping: Dict[str, str],
+                        inplace: bool = False) -> tuple[pd.DataFrame, Dict[str, int]]:
+        """Convert mapped columns to their field types without copying the frame.
+        
+        Converted columns replace the originals on a shallow copy (or on ``df`` itself
+        with ``inplace``), so unconverted columns share memory with the input. Returns
+        the frame and the number of values per column that did not convert (coerced
+        to NaN/0 or to the default boolean/gender).
+        """
+        transformed_df = df if inplace else df.copy(deep=False)
+        failures: Dict[str, int] = {}
         
         for column, field_type in mapping.items():
             if column not in transformed_df.columns:
                 continue
-                
+            
+            source = transformed_df[column]
+            present = source.notna()
             try:
-                if field_type == 'id':
-                    transformed_df[column] = pd.to_numeric(transformed_df[column], errors='coerce')
-                elif field_type in ['birth_date', 'date', 'plan_start_date']:
-                    transformed_df[column] = pd.to_datetime(transformed_df[column], errors='coerce')
-                elif field_type in ['likes', 'comments', 'saves', 'reach', 'profile_visits', 'new_followers']:
-                    # Convert to numeric and handle NaN values
-                    numeric_data = pd.to_numeric(transformed_df[column], errors='coerce')
-                    numeric_data = numeric_data.replace([np.nan, None], 0)
-                    transformed_df[column] = numeric_data.astype(int)
-                elif field_type in ['monthly_value', 'total_value']:
-                    transformed_df[column] = pd.to_numeric(transformed_df[column], errors='coerce')
-                elif field_type in ['gympass', 'active_plan']:
-                    transformed_df[column] = transformed_df[column].apply(
-                        lambda x: str(x).strip().lower() in ['true', 'sim', 'yes', '1', 'ativo']
-                    )
+                if field_type in ['id', 'monthly_value', 'total_value']:
+                    converted = pd.to_numeric(source, errors='coerce')
+                    failed = converted.isna() & present
+                elif field_type in _DATE_FIELDS:
+                    converted = pd.to_datetime(source, errors='coerce')
+                    failed = converted.isna() & present
+                elif field_type in _COUNT_FIELDS:
+                    numeric_data = pd.to_numeric(source, errors='coerce')
+                    failed = numeric_data.isna() & present
+                    converted = numeric_data.fillna(0).astype(int)
+                elif field_type in _BOOLEAN_FIELDS:
+                    if pd.api.types.is_bool_dtype(source):
+                        continue
+                    codes, tokens = ColumnMapper._factorize_tokens(source, str.lower)
+                    converted = pd.Series(np.isin(tokens, list(_TRUE_TOKENS))[codes], index=source.index)
+                    recognized = np.isin(tokens, list(_TRUE_TOKENS | _FALSE_TOKENS))[codes]
+                    failed = ~recognized & present
                 elif field_type == 'gender':
-                    transformed_df[column] = transformed_df[column].apply(
-                        lambda x: 'M' if str(x).strip().upper() in ['M', 'MASCULINO', 'MALE'] else 'F'
-                    )
-            except Exception as e:
-                print(f"Warning: Could not transform column {column}: {e}")
+                    # Anything not recognized as male defaults to 'F', as before
+                    codes, tokens = ColumnMapper._factorize_tokens(source, str.upper)
+                    genders = np.array([_GENDER_TOKENS.get(token, 'F') for token in tokens], dtype=object)
+                    converted = pd.Series(genders[codes], index=source.index)
+                    failed = ~np.isin(tokens, list(_GENDER_TOKENS))[codes] & present
+                else:
+                    continue
+            except Exception:
+                failures[column] = len(source)
+                continue
+            
+            transformed_df[column] = converted
+            if failed.any():
+                failures[column] = int(failed.sum())
         
+        return transformed_df, failures
+    
+    @staticmethod
+    def transform_dataframe(df: pd.DataFrame, mapping: Dict[str, str], inplace: bool = False) -> pd.DataFrame:
+        """Transform DataFrame using the column mapping."""
+        transformed_df, failures = ColumnMapper.convert_columns(df, mapping, inplace)
+        if failures:
+            logger.warning(f"Values that could not be converted per column: {failures}")
         return transformed_df
+    
+    @staticmethod
+    def read_chunks(path: str, chunk_size: int = 50000, mapping: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """Read a CSV (plain, .csv.gz or .csv.zst) in chunks and yield them transformed.
+        
+        Compressed files are decompressed incrementally as chunks are parsed, and the
+        mapping is detected on the first chunk unless given.
+        """
+        with pd.read_csv(path, chunksize=chunk_size, compression='infer') as reader:
+            for chunk in reader:
+                if mapping is None:
+                    mapping = ColumnMapper.create_column_mapping(chunk)
+                yield ColumnMapper.transform_dataframe(chunk, mapping, inplace=True)
 
 class Student(BaseModel):
     """Student data model for Social FIT."""
@@ -133,8 +272,7 @@ class Student(BaseModel):
     plan_start_date: datetime = Field(alias="Data Início Plano")
     active_plan: bool = Field(alias="Plano Ativo")
     
-    class Config:
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class InstagramPost(BaseModel):
     """Instagram post data model for Social FIT."""
@@ -147,8 +285,40 @@ class InstagramPost(BaseModel):
     new_followers: int = Field(alias="Novos Seguidores")
     main_hashtag: str = Field(alias="Hashtag Principal")
     
-    class Config:
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True)
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached ``TypeAdapter(List[model])``; building the validator is the expensive part."""
+    return TypeAdapter(List[model])
+
+def validate_records(model: Type[ModelT], records: Iterable[Dict[str, Any]], trusted: bool = False) -> List[ModelT]:
+    """Validate a whole list of records (field names or aliases) into models in one call.
+    
+    Raises ``pydantic.ValidationError`` listing every invalid record by index. With
+    ``trusted=True`` validation is skipped and models are built with ``model_construct``;
+    use it only for data already validated and coerced (e.g. by the columnar ETL
+    transforms), since values are stored as given.
+    """
+    if trusted:
+        # Complete field-named records (the columnar transforms' output) skip computing the fields set
+        field_names = set(model.model_fields)
+        return [
+            model.model_construct(_fields_set=set(field_names), **record) if record.keys() == field_names
+            else model.model_construct(**record)
+            for record in records
+        ]
+    return _list_adapter(model).validate_python(list(records))
+
+def validate_students(records: Iterable[Dict[str, Any]], trusted: bool = False) -> List[Student]:
+    """Bulk-validate student records, see ``validate_records``."""
+    return validate_records(Student, records, trusted)
+
+def validate_instagram_posts(records: Iterable[Dict[str, Any]], trusted: bool = False) -> List[InstagramPost]:
+    """Bulk-validate Instagram post records, see ``validate_records``."""
+    return validate_records(InstagramPost, records, trusted)
 
 class StudentAnalytics(BaseModel):
     """Analytics model for student data."""
@@ -76,6 +76,20 @@ CREATE INDEX IF NOT EXISTS idx_students_plan_type ON students(plan_type);
 CREATE INDEX IF NOT EXISTS idx_students_active_plan ON students(active_plan);
 CREATE INDEX IF NOT EXISTS idx_students_plan_start_date ON students(plan_start_date);
 
+-- Natural key used by the upsert (ON CONFLICT) load path
+CREATE UNIQUE INDEX IF NOT EXISTS uq_students_name_birth_date ON students(name, birth_date);
+
+-- Every update moves updated_at, the watermark the local replicas sync on
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS students_set_updated_at ON students;
+CREATE TRIGGER students_set_updated_at BEFORE UPDATE ON students
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 -- Add comments for documentation
 COMMENT ON TABLE students IS 'Student enrollment data for Social FIT gym';
 COMMENT ON COLUMN students.name IS 'Full name of the student';
@@ -102,7 +116,8 @@ CREATE TABLE IF NOT EXISTS instagram_posts (
     new_followers INTEGER NOT NULL,
     main_hashtag VARCHAR(100) NOT NULL,
     engagement_rate DECIMAL(5,4),
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 -- Create indexes for better performance
@@ -110,6 +125,15 @@ CREATE INDEX IF NOT EXISTS idx_instagram_post_date ON instagram_posts(post_date)
 CREATE INDEX IF NOT EXISTS idx_instagram_main_hashtag ON instagram_posts(main_hashtag);
 CREATE INDEX IF NOT EXISTS idx_instagram_engagement_rate ON instagram_posts(engagement_rate);
 
+-- Natural key used by the upsert (ON CONFLICT) load path
+CREATE UNIQUE INDEX IF NOT EXISTS uq_instagram_posts_post_date_hashtag ON instagram_posts(post_date, main_hashtag);
+
+-- Every update moves updated_at, the watermark the local replicas sync on (set_updated_at() is created with students)
+ALTER TABLE instagram_posts ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+DROP TRIGGER IF EXISTS instagram_posts_set_updated_at ON instagram_posts;
+CREATE TRIGGER instagram_posts_set_updated_at BEFORE UPDATE ON instagram_posts
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 -- Add comments for documentation
 COMMENT ON TABLE instagram_posts IS 'Instagram post performance data for Social FIT';
 COMMENT ON COLUMN instagram_posts.engagement_rate IS 'Calculated engagement rate (likes + comments + saves) / reach';
@@ -187,6 +211,8 @@ CREATE TABLE students (
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
+
+CREATE UNIQUE INDEX uq_students_name_birth_date ON students(name, birth_date);
 ```
 
 ### Instagram Posts Table
@@ -202,8 +228,28 @@ CREATE TABLE instagram_posts (
     new_followers INTEGER NOT NULL,
     main_hashtag VARCHAR(100) NOT NULL,
     engagement_rate DECIMAL(5,4),
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
 );
+
+CREATE UNIQUE INDEX uq_instagram_posts_post_date_hashtag ON instagram_posts(post_date, main_hashtag);
+```
+
+### updated_at Triggers
+Updates must move `updated_at`, the local replicas sync on it:
+```sql
+-- Every update moves updated_at, the watermark the local replicas sync on
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER students_set_updated_at BEFORE UPDATE ON students
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER instagram_posts_set_updated_at BEFORE UPDATE ON instagram_posts
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
 ```
 
 ### Analytics Table
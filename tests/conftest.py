@@ -90,4 +90,16 @@ def sample_instagram_post_dict():
         'profile_visits': 50,
         'new_followers': 15,
         'main_hashtag': '#socialfit'
-    } 
\ No newline at end of file
+    } 
+
+
+@pytest.fixture(autouse=True)
+def quarantine_dir(tmp_path, monkeypatch):
+    """Keep quarantine files and replicas written by the ETL out of the working tree"""
+    try:
+        from src.config import settings
+    except Exception:
+        return None
+    monkeypatch.setattr(settings, 'QUARANTINE_DIR', str(tmp_path / 'quarantine'))
+    monkeypatch.setattr(settings, 'REPLICA_DIR', str(tmp_path / 'replica'))
+    return tmp_path / 'quarantine'
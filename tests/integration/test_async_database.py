@@ -0,0 +1,137 @@
+"""
+Integration Tests for the Async Database Manager
+==============================================
+
+Integration tests for AsyncDatabaseManager against a local fake PostgREST server.
+"""
+
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from unittest.mock import patch
+from src.database import AsyncDatabaseManager
+from src.database.batching import write_batches_async
+
+
+class FakePostgREST:
+    """Serves one in-memory table per path, with offset/limit paging and exact counts"""
+    
+    def __init__(self, tables):
+        self.tables = tables
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def handle(self, request):
+        table = request.match_info['table']
+        self.requests.append((request.method, table, dict(request.query), request.headers.get('Prefer')))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            rows = self.tables.setdefault(table, [])
+            if request.method == 'POST':
+                payload = json.loads(await request.text())
+                rows.extend(payload if isinstance(payload, list) else [payload])
+                return web.Response(status=201)
+            filtered = [row for row in rows if all(
+                str(row.get(column)) == value[3:] for column, value in request.query.items() if value.startswith('eq.'))]
+            offset = int(request.query.get('offset', 0))
+            limit = int(request.query.get('limit', len(filtered)))
+            page = filtered[offset:offset + limit]
+            headers = {'Content-Range': f"{offset}-{offset + len(page) - 1}/{len(filtered)}"}
+            return web.json_response(page, headers=headers)
+        finally:
+            self.in_flight -= 1
+
+
+def _run_with_server(tables, scenario):
+    """Run ``scenario(db, server)`` against a fake PostgREST on localhost"""
+    async def main():
+        server = FakePostgREST(tables)
+        app = web.Application()
+        app.router.add_route('*', '/rest/v1/{table}', server.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            with patch('src.database.async_database.credential_manager.get_supabase_config',
+                       return_value={'url': f'http://127.0.0.1:{port}', 'key': 'eyJx'}):
+                async with AsyncDatabaseManager() as db:
+                    return await scenario(db, server)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+class TestAsyncDatabaseManager:
+    """Integration tests for AsyncDatabaseManager"""
+    
+    @pytest.mark.integration
+    def test_paged_read_is_complete_and_typed(self):
+        """Pages are awaited concurrently and decoded into typed columns"""
+        posts = [{'id': i, 'post_date': '2024-01-01', 'likes': i, 'main_hashtag': '#a'} for i in range(25)]
+        
+        async def scenario(db, server):
+            with patch('src.database.async_database.settings.READ_PAGE_SIZE', 10):
+                return await db.get_instagram_posts(columns=['id', 'post_date', 'likes', 'main_hashtag']), server
+        
+        posts_df, server = _run_with_server({'instagram_posts': posts}, scenario)
+        
+        assert posts_df['id'].tolist() == list(range(25))
+        assert posts_df['post_date'].dtype == 'datetime64[ns]'
+        assert len(server.requests) == 3
+        assert server.requests[0][3] == 'count=exact'
+    
+    @pytest.mark.integration
+    def test_insert_skips_existing_and_bounds_concurrency(self, sample_student_dict):
+        """New rows are written in concurrent batches, never more than the in-flight limit"""
+        from src.models import Student
+        students = [Student(**{**sample_student_dict, 'name': f'Aluno {i}'}) for i in range(12)]
+        existing = [{'id': 1, 'name': 'Aluno 0', 'birth_date': students[0].birth_date.date().isoformat()}]
+        
+        async def scenario(db, server):
+            db.max_in_flight = 3
+            with patch('src.database.async_database.settings.BATCH_SIZE', 1):
+                success = await db.insert_students(students)
+            return success, server
+        
+        success, server = _run_with_server({'students': existing}, scenario)
+        
+        assert success is True
+        posts = [request for request in server.requests if request[0] == 'POST']
+        assert len(posts) == 11
+        assert server.max_in_flight <= 3
+    
+    @pytest.mark.integration
+    def test_analytics_roundtrip(self):
+        """Analytics are stored once per metric and date"""
+        async def scenario(db, server):
+            data = {'date': '2024-01-01', 'metric_name': 'm', 'metric_value': {'x': 1}}
+            assert await db.insert_analytics(data) is True
+            assert await db.insert_analytics(data) is True
+            assert await db.check_analytics_exists('m', '2024-01-01') is True
+            return await db.get_analytics('m')
+        
+        analytics_df = _run_with_server({}, scenario)
+        
+        assert len(analytics_df) == 1
+
+
+class TestAsyncBatches:
+    """Tests for the coroutine batch writer"""
+    
+    @pytest.mark.integration
+    def test_failed_batch_is_reported(self):
+        """A failing batch is recorded by index and does not stop the others"""
+        async def write(batch):
+            if batch[0]['n'] == 2:
+                raise RuntimeError("boom")
+        
+        report = asyncio.run(write_batches_async('students', [{'n': n} for n in range(5)], write, 1, 4))
+        
+        assert report.rows_written == 4
+        assert report.failed_batches == {2: 'boom'}
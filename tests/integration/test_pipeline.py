@@ -9,6 +9,7 @@ import pytest
 import pandas as pd
 from unittest.mock import patch, Mock
 from src.etl import SocialFITETL
+from src.models import InstagramPost
 from src.database import DatabaseManager
 from src.analytics import AnalyticsEngine
 
@@ -231,4 +232,162 @@ class TestPipelineIntegration:
         # Memory increase should be reasonable (adjust threshold as needed)
         assert memory_increase < 100  # 100 MB threshold
         assert len(students) == 3
-        assert len(posts) == 3 
\ No newline at end of file
+        assert len(posts) == 3 
+
+@pytest.fixture
+def csv_data_dir(tmp_path):
+    """Data directory with small students and Instagram exports"""
+    pd.DataFrame({
+        'ID': [1, 2, 3, 4, 5],
+        'Nome': ['Ana', 'Bruno', 'Carla', 'Davi', 'Eva'],
+        'Gênero': ['F', 'M', 'F', 'M', 'X'],
+        'Data de Nascimento': ['1990-01-01'] * 5,
+        'Endereço': ['Rua A'] * 5,
+        'Bairro': ['Cabral', 'Centro', 'Cabral', 'Ahú', 'Centro'],
+        'Tipo_Plano': ['Mensal', 'Anual', 'Trimestral', 'Mensal', 'Mensal'],
+        'Gympass': ['True', 'False', 'False', 'True', 'False'],
+        'Valor_Plano_Mensal (R$)': [99.9] * 5,
+        'Valor_Plano_Total (R$)': [99.9] * 5,
+        'Data Início Plano': ['2024-01-01'] * 5,
+        'Plano Ativo': ['True'] * 5
+    }).to_csv(tmp_path / 'social_fit_alunos.csv', index=False)
+    pd.DataFrame({
+        'Data': ['2024-01-01', '2024-01-02', '2024-01-03'],
+        'Likes': [150, 200, 180],
+        'Comentários': [25, 30, 28],
+        'Salvamentos': [10, 15, 12],
+        'Alcance': [1000, 1200, 1100],
+        'Visitas ao Perfil': [50, 60, 55],
+        'Novos Seguidores': [15, 20, 18],
+        'Hashtag Principal': ['#socialfit', '#fitness', '#workout']
+    }).to_csv(tmp_path / 'social_fit_instagram.csv', index=False)
+    return tmp_path
+
+
+class TestStreamingPipeline:
+    """Integration tests for chunked extract/transform/load"""
+    
+    @pytest.mark.integration
+    def test_streaming_load_consumes_chunks(self, csv_data_dir):
+        """Each chunk is transformed and handed to the loader as a typed frame"""
+        with patch('src.etl.etl_pipeline.DatabaseManager') as mock_db_class, \
+             patch('src.etl.etl_pipeline.settings.DATA_DIR', str(csv_data_dir)), \
+             patch('src.etl.etl_pipeline.settings.EXTRACT_CHUNK_SIZE', 2):
+            mock_db = mock_db_class.return_value
+            mock_db.insert_students.return_value = True
+            mock_db.insert_instagram_posts.return_value = True
+            
+            etl = SocialFITETL()
+            success = etl.run_streaming_load()
+            
+            assert success is True
+            student_chunks = [call.args[0] for call in mock_db.insert_students.call_args_list]
+            assert [len(chunk) for chunk in student_chunks] == [2, 2]
+            assert isinstance(student_chunks[0], pd.DataFrame)
+            assert mock_db.insert_instagram_posts.call_count == 2
+            mock_db.cached_keys.assert_called_once()
+
+
+class TestPartitionedInputs:
+    """Integration tests for multi-file sources"""
+    
+    @pytest.mark.integration
+    def test_rerun_only_reads_new_files(self, csv_data_dir):
+        """Files loaded by a previous run are skipped by the next one"""
+        posts = pd.read_csv(csv_data_dir / 'social_fit_instagram.csv')
+        (csv_data_dir / 'posts').mkdir()
+        posts.iloc[:2].to_csv(csv_data_dir / 'posts' / '2024-01.csv', index=False)
+        
+        with patch('src.etl.etl_pipeline.DatabaseManager') as mock_db_class, \
+             patch('src.etl.etl_pipeline.settings.DATA_DIR', str(csv_data_dir)), \
+             patch('src.etl.etl_pipeline.settings.INSTAGRAM_FILE', 'posts'), \
+             patch('src.etl.etl_pipeline.settings.TRACK_INGESTED_FILES', True), \
+             patch('src.etl.etl_pipeline.settings.INGEST_LEDGER_PATH', str(csv_data_dir / 'ledger.json')):
+            mock_db = mock_db_class.return_value
+            mock_db.insert_students.return_value = True
+            mock_db.insert_instagram_posts.return_value = True
+            mock_db.get_students.return_value = pd.DataFrame()
+            
+            assert SocialFITETL().run_full_pipeline().success is True
+            
+            posts.iloc[2:].to_csv(csv_data_dir / 'posts' / '2024-02.csv', index=False)
+            etl = SocialFITETL()
+            students_df, instagram_df = etl.extract_data()
+            
+            assert students_df.empty
+            assert list(instagram_df['Hashtag Principal']) == ['#workout']
+    
+    @pytest.mark.integration
+    @pytest.mark.parametrize('suffix', ['.csv.gz', '.csv.zst'])
+    def test_streaming_compressed_partitions(self, csv_data_dir, suffix):
+        """Compressed partitions are decompressed chunk by chunk while streaming"""
+        posts = pd.read_csv(csv_data_dir / 'social_fit_instagram.csv')
+        (csv_data_dir / 'posts').mkdir()
+        posts.to_csv(csv_data_dir / 'posts' / f'2024-01{suffix}', index=False)
+        
+        with patch('src.etl.etl_pipeline.DatabaseManager'), \
+             patch('src.etl.etl_pipeline.settings.DATA_DIR', str(csv_data_dir)), \
+             patch('src.etl.etl_pipeline.settings.INSTAGRAM_FILE', 'posts'):
+            etl = SocialFITETL()
+            chunks = list(etl.extract_chunks('posts', InstagramPost, chunk_size=2))
+            _, extracted = etl.extract_data()
+        
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert list(extracted['Likes']) == [150, 200, 180]
+
+
+class TestParallelSources:
+    """Integration tests for the concurrent student and Instagram branches"""
+    
+    @pytest.mark.integration
+    def test_branches_run_concurrently(self, csv_data_dir):
+        """Students are loaded while the Instagram branch is running, then both are joined"""
+        import threading
+        posts_loaded = threading.Event()
+        
+        def insert_posts(posts):
+            posts_loaded.set()
+            return True
+        
+        with patch('src.etl.etl_pipeline.DatabaseManager') as mock_db_class, \
+             patch('src.etl.etl_pipeline.settings.DATA_DIR', str(csv_data_dir)), \
+             patch('src.etl.etl_pipeline.settings.PARALLEL_SOURCES', True), \
+             patch('src.etl.etl_pipeline.settings.QUARANTINE_ENABLED', True):
+            mock_db = mock_db_class.return_value
+            # Only succeeds if the Instagram branch progresses while students are loading
+            mock_db.insert_students.side_effect = lambda students: posts_loaded.wait(timeout=5)
+            mock_db.insert_instagram_posts.side_effect = insert_posts
+            mock_db.get_students.return_value = pd.DataFrame()
+            
+            result = SocialFITETL().run_full_pipeline()
+            
+            assert result.success is True
+            assert len(mock_db.insert_students.call_args.args[0]) == 4
+            mock_db.get_students.assert_called_once()
+            # The student with gender 'X' (line 6) was quarantined, not loaded
+            assert result.rejected_rows == {'student': 1}
+            quarantined = pd.read_csv(result.quarantine_path)
+            assert list(quarantined['line']) == [6]
+
+
+class TestRejectedRows:
+    """Integration tests for the per-run rejection summary"""
+    
+    @pytest.mark.integration
+    def test_rejections_summarized_without_quarantine_file(self, csv_data_dir):
+        """Rejected rows are counted per error category across chunks even with the quarantine off"""
+        with patch('src.etl.etl_pipeline.DatabaseManager') as mock_db_class, \
+             patch('src.etl.etl_pipeline.settings.DATA_DIR', str(csv_data_dir)), \
+             patch('src.etl.etl_pipeline.settings.STREAMING_EXTRACT', True), \
+             patch('src.etl.etl_pipeline.settings.EXTRACT_CHUNK_SIZE', 2):
+            mock_db = mock_db_class.return_value
+            mock_db.insert_students.return_value = True
+            mock_db.insert_instagram_posts.return_value = True
+            mock_db.get_students.return_value = pd.DataFrame()
+            
+            result = SocialFITETL().run_full_pipeline()
+            
+            assert result.success is True
+            assert result.rejected_rows == {'student': 1}
+            assert result.rejected_by_error == {'student: gender': 1}
+            assert result.quarantine_path is None
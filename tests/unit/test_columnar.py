@@ -0,0 +1,170 @@
+"""
+Unit Tests for Columnar Transforms
+=================================
+
+Test cases for the vectorized, column-at-a-time ETL transforms.
+"""
+
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from src.etl.columnar import transform_students_frame, transform_instagram_frame
+from src.etl.schema import csv_schema, read_csv_typed
+from src.etl.sharding import ShardedTransformer
+from src.models import Student, Gender, PlanType
+
+
+@pytest.fixture
+def raw_students_df():
+    """Raw students export using the CSV headers"""
+    return pd.DataFrame({
+        'ID': [1, 2, 'x'],
+        'Nome': ['João Silva', 'Maria Santos', 'Pedro Costa'],
+        'Gênero': ['M', 'X', 'M'],
+        'Data de Nascimento': ['1990-01-01', '1985-05-15', 'not a date'],
+        'Endereço': ['Rua A, 123', 'Rua B, 456', 'Rua C, 789'],
+        'Bairro': ['Centro', 'Cabral', 'Jardim'],
+        'Tipo_Plano': ['Mensal', 'Trimestral', 'Anual'],
+        'Gympass': ['True', 'false', ' TRUE '],
+        'Valor_Plano_Mensal (R$)': [89.9, 79.9, 69.9],
+        'Valor_Plano_Total (R$)': [89.9, 239.7, 838.8],
+        'Data Início Plano': ['2024-01-01', '2024-01-15', '2024-02-01'],
+        'Plano Ativo': ['True', 'True', 'False']
+    })
+
+
+class TestColumnarStudents:
+    """Test cases for transform_students_frame"""
+    
+    def test_valid_rows_are_typed(self, raw_students_df):
+        """Valid rows come out with typed columns and model field names"""
+        batch = transform_students_frame(raw_students_df)
+        
+        assert len(batch) == 1
+        assert batch.frame['id'].tolist() == [1]
+        assert batch.frame['gympass'].tolist() == [True]
+        assert str(batch.frame['birth_date'].dtype).startswith('datetime64')
+    
+    def test_invalid_rows_have_reasons(self, raw_students_df):
+        """Invalid rows are masked and explained per field"""
+        batch = transform_students_frame(raw_students_df)
+        
+        assert batch.invalid_mask.tolist() == [False, True, True]
+        assert batch.error_summary() == {'id': 1, 'gender': 1, 'birth_date': 1}
+        reasons = batch.reasons()
+        assert reasons[1] == 'gender: must be one of M, F'
+        assert reasons[2] == 'id: not an integer; birth_date: invalid date'
+    
+    def test_missing_column_rejects_all_rows(self, raw_students_df):
+        """A missing source column invalidates every row"""
+        batch = transform_students_frame(raw_students_df.drop(columns=['Bairro']))
+        
+        assert len(batch) == 0
+        assert "missing column 'Bairro'" in batch.reasons()[0]
+    
+    def test_models_built_on_demand(self, raw_students_df):
+        """to_models builds Student instances for valid rows only"""
+        students = transform_students_frame(raw_students_df).to_models()
+        
+        assert len(students) == 1
+        assert isinstance(students[0], Student)
+        assert students[0].gender == Gender.MALE
+        assert students[0].plan_type == PlanType.MONTHLY
+
+
+class TestColumnarInstagram:
+    """Test cases for transform_instagram_frame"""
+    
+    def test_counts_coerced_and_engagement_computed(self):
+        """Counts default to 0 with a per-column tally and engagement is vectorized"""
+        raw = pd.DataFrame({
+            'Data': ['2024-01-01', '2024-01-02', 'bad'],
+            'Likes': [150, 'n/a', 10],
+            'Comentários': [25, 30, 1],
+            'Salvamentos': [25, 10, 1],
+            'Alcance': [1000, 0, 100],
+            'Visitas ao Perfil': [50, 60, 5],
+            'Novos Seguidores': [15, None, 1],
+            'Hashtag Principal': ['#socialfit', '#fitness', '#treino']
+        })
+        
+        batch = transform_instagram_frame(raw)
+        
+        assert len(batch) == 2
+        assert batch.error_summary() == {'date': 1}
+        assert batch.coerced == {'likes': 1, 'new_followers': 1}
+        assert batch.frame['likes'].tolist() == [150, 0]
+        assert batch.frame['engagement_rate'].tolist() == [0.2, 0.0]
+        posts = batch.to_models()
+        assert [post.main_hashtag for post in posts] == ['#socialfit', '#fitness']
+
+
+class TestCsvSchema:
+    """Test cases for the declared extraction schema"""
+    
+    def test_schema_derived_from_model_aliases(self):
+        """Dates are parsed, enums and low-cardinality fields are categorical"""
+        options = csv_schema(Student)
+        
+        assert options['parse_dates'] == ['Data de Nascimento', 'Data Início Plano']
+        assert options['dtype']['Bairro'] == 'category'
+        assert options['dtype']['Gênero'] == 'category'
+        assert options['dtype']['ID'] == 'Int64'
+        assert 'Valor_Plano_Mensal (R$)' not in csv_schema(Student, numeric=False)['dtype']
+    
+    def test_typed_read_feeds_columnar_transform(self, raw_students_df, tmp_path):
+        """Typed columns survive the transform; bad numerics fall back to inference"""
+        path = tmp_path / 'alunos.csv'
+        raw_students_df.to_csv(path, index=False)
+        
+        df = read_csv_typed(str(path), Student)
+        batch = transform_students_frame(df)
+        
+        assert len(batch) == 1
+        assert batch.error_summary() == {'id': 1, 'gender': 1, 'birth_date': 1}
+        
+        valid = raw_students_df.iloc[:1]
+        valid.to_csv(path, index=False)
+        df = read_csv_typed(str(path), Student)
+        assert isinstance(df['Bairro'].dtype, pd.CategoricalDtype)
+        assert str(df['Data de Nascimento'].dtype).startswith('datetime64')
+        assert isinstance(transform_students_frame(df).frame['neighborhood'].dtype, pd.CategoricalDtype)
+
+
+class TestShardedTransform:
+    """Test cases for ShardedTransformer"""
+    
+    def test_sharded_matches_serial(self, raw_students_df):
+        """Shards are transformed in worker processes and merged in input order"""
+        df = pd.concat([raw_students_df.astype(str)] * 4, ignore_index=True)
+        serial = transform_students_frame(df)
+        
+        sharder = ShardedTransformer(workers=2, min_rows=1)
+        try:
+            sharded = sharder.transform(df, transform_students_frame)
+        finally:
+            sharder.shutdown()
+        
+        pd.testing.assert_frame_equal(sharded.frame, serial.frame)
+        pd.testing.assert_frame_equal(sharded.errors, serial.errors)
+        assert sharded.error_summary() == serial.error_summary()
+    
+    def test_concurrent_branches_share_one_pool(self):
+        """Threads asking for the pool at the same time all get the same one"""
+        sharder = ShardedTransformer(workers=2, min_rows=1)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                pools = list(executor.map(lambda _: sharder._pool(), range(32)))
+        finally:
+            sharder.shutdown()
+        
+        assert len({id(pool) for pool in pools}) == 1
+    
+    def test_serial_fallback(self, raw_students_df):
+        """Small inputs and mixed-type frames are transformed in process"""
+        sharder = ShardedTransformer(workers=2, min_rows=1)
+        
+        batch = sharder.transform(raw_students_df, transform_students_frame)
+        
+        assert len(batch) == 1
+        assert ShardedTransformer(workers=2, min_rows=10).transform(raw_students_df, transform_students_frame).rejected_count == 2
@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Input Cache
+=============================
+
+Test cases for the Parquet cache of parsed CSV inputs.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from unittest.mock import Mock
+from src.etl.input_cache import InputCache
+
+
+def _write_csv(path, likes):
+    pd.DataFrame({'Data': ['2024-01-01', '2024-01-02'], 'Likes': likes}).to_csv(path, index=False)
+
+
+class TestInputCache:
+    """Test cases for InputCache"""
+    
+    def test_unchanged_file_served_from_cache(self, tmp_path):
+        """A second load of the same file does not call the reader"""
+        source = tmp_path / 'posts.csv'
+        _write_csv(source, [1, 2])
+        reader = Mock(side_effect=pd.read_csv)
+        
+        cache = InputCache(str(tmp_path / 'cache'), max_bytes=10**7)
+        first = cache.load(str(source), reader)
+        second = InputCache(str(tmp_path / 'cache'), max_bytes=10**7).load(str(source), reader)
+        
+        assert reader.call_count == 1
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_touched_file_with_same_content_is_a_hit(self, tmp_path):
+        """Only the content hash decides once size/mtime change"""
+        source = tmp_path / 'posts.csv'
+        _write_csv(source, [1, 2])
+        reader = Mock(side_effect=pd.read_csv)
+        cache = InputCache(str(tmp_path / 'cache'), max_bytes=10**7)
+        cache.load(str(source), reader)
+        
+        os.utime(source, ns=(0, 0))
+        cache.load(str(source), reader)
+        
+        assert reader.call_count == 1
+    
+    def test_changed_file_is_reparsed(self, tmp_path):
+        """Modified content is re-read and the new result returned"""
+        source = tmp_path / 'posts.csv'
+        _write_csv(source, [1, 2])
+        cache = InputCache(str(tmp_path / 'cache'), max_bytes=10**7)
+        cache.load(str(source), pd.read_csv)
+        
+        _write_csv(source, [10, 20])
+        df = cache.load(str(source), pd.read_csv)
+        
+        assert df['Likes'].tolist() == [10, 20]
+    
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Old entries are dropped once the cache exceeds its cap"""
+        cache_dir = tmp_path / 'cache'
+        cache = InputCache(str(cache_dir), max_bytes=10**7)
+        for name, likes in [('a.csv', [1, 2]), ('b.csv', [3, 4])]:
+            _write_csv(tmp_path / name, likes)
+            cache.load(str(tmp_path / name), pd.read_csv)
+        entry_bytes = max(entry['bytes'] for entry in cache._manifest['entries'].values())
+        
+        cache.max_bytes = entry_bytes
+        _write_csv(tmp_path / 'c.csv', [5, 6])
+        cache.load(str(tmp_path / 'c.csv'), pd.read_csv)
+        
+        assert len(cache._manifest['entries']) == 1
+        assert len([f for f in os.listdir(cache_dir) if f.endswith('.parquet')]) == 1
+    
+    def test_concurrent_loads(self, tmp_path):
+        """Loads from many threads keep every entry in the manifest"""
+        paths = []
+        for number in range(8):
+            _write_csv(tmp_path / f'{number}.csv', [number, number + 1])
+            paths.append(str(tmp_path / f'{number}.csv'))
+        cache = InputCache(str(tmp_path / 'cache'), max_bytes=10**7)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            frames = list(executor.map(lambda path: cache.load(path, pd.read_csv), paths * 5))
+        
+        assert [frame['Likes'][0] for frame in frames[:8]] == list(range(8))
+        assert len(InputCache(str(tmp_path / 'cache'), max_bytes=10**7)._manifest['sources']) == 8
+        assert not [f for f in os.listdir(tmp_path / 'cache') if f.endswith('.tmp')]
@@ -6,8 +6,13 @@ Test cases for Pydantic models and data validation.
 """
 
 import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
 from datetime import datetime
-from src.models import Student, InstagramPost, ColumnMapper
+from pydantic import ValidationError
+from src.models import Student, InstagramPost, ColumnMapper, Gender
+from src.models import validate_students, validate_instagram_posts, CompactRecords
 from src.models import StudentAnalytics, InstagramAnalytics, CrossPlatformAnalytics
 
 
@@ -83,6 +88,69 @@ class TestInstagramPostModel:
         assert post_dict['main_hashtag'] == "#socialfit"
 
 
+class TestBulkValidation:
+    """Test cases for list-at-once model validation"""
+    
+    def test_validate_students_bulk(self, sample_student_dict):
+        """Records are validated in one call into Student models"""
+        students = validate_students([sample_student_dict, dict(sample_student_dict, id=2)])
+        
+        assert [student.id for student in students] == [1, 2]
+        assert students[0].gender == "M"
+    
+    def test_validate_reports_invalid_record_index(self, sample_instagram_post_dict):
+        """A single ValidationError points at the invalid record"""
+        records = [sample_instagram_post_dict, dict(sample_instagram_post_dict, likes='many')]
+        
+        with pytest.raises(ValidationError) as exc_info:
+            validate_instagram_posts(records)
+        
+        assert exc_info.value.errors()[0]['loc'][:2] == (1, 'likes')
+    
+    def test_trusted_construct_skips_validation(self, sample_student_dict):
+        """Trusted records are stored as given and behave like validated models"""
+        students = validate_students([dict(sample_student_dict)], trusted=True)
+        
+        assert isinstance(students[0], Student)
+        assert students[0].name == "João Silva"
+        assert students[0].model_fields_set == set(Student.model_fields)
+    
+    def test_trusted_models_do_not_share_the_record(self, sample_student_dict):
+        """Editing the source record afterwards leaves the model unchanged"""
+        record = dict(sample_student_dict)
+        student = validate_students([record], trusted=True)[0]
+        
+        record['name'] = "Outro Nome"
+        
+        assert student.name == "João Silva"
+
+
+class TestCompactRecords:
+    """Test cases for the struct-of-arrays record form"""
+    
+    def test_round_trip_students(self, sample_student_dict):
+        """Students convert to compact arrays and back without loss"""
+        students = validate_students([sample_student_dict, {**sample_student_dict, 'id': 2, 'gender': 'F'}])
+        
+        compact = CompactRecords.from_models(students)
+        
+        assert compact.arrays['gender'].dtype == np.int8
+        assert compact.arrays['plan_type'].dtype == np.int8
+        assert compact.arrays['birth_date'].dtype == np.int32
+        assert compact.to_models() == students
+        assert compact.to_models()[1].gender is Gender.FEMALE
+    
+    def test_time_of_day_is_kept(self, sample_instagram_post_dict):
+        """Dates with a time of day fall back to nanosecond storage"""
+        post = InstagramPost(**{**sample_instagram_post_dict, 'date': datetime(2024, 1, 1, 18, 30)})
+        
+        compact = CompactRecords.from_models([post])
+        
+        assert compact.arrays['date'].dtype == np.int64
+        assert compact.to_models()[0].date == datetime(2024, 1, 1, 18, 30)
+        assert compact.to_frame()['likes'].dtype == 'int64'
+
+
 class TestColumnMapper:
     """Test cases for ColumnMapper utility"""
     
@@ -136,6 +204,60 @@ class TestColumnMapper:
         assert 'ID' in mapping
         assert 'Nome' in mapping
         assert 'Unknown_Column' not in mapping
+    
+    def test_detect_column_type_uses_sample_values(self):
+        """Sampled values rule out header matches of the wrong kind"""
+        assert ColumnMapper.detect_column_type('Valor_Plano_Total (R$)', [89.9, 239.7]) == 'total_value'
+        assert ColumnMapper.detect_column_type('Data Início Plano', ['2024-01-01']) == 'plan_start_date'
+        assert ColumnMapper.detect_column_type('Plano Ativo', [True, False]) == 'active_plan'
+        assert ColumnMapper.detect_column_type('Tipo_Plano', ['Mensal']) == 'plan_type'
+        assert ColumnMapper.detect_column_type('Sem Relação', ['x']) == 'unknown'
+    
+    def test_mapping_memoized_by_header_signature(self, sample_instagram_df):
+        """Frames with the same headers reuse the cached mapping"""
+        first = ColumnMapper.create_column_mapping(sample_instagram_df)
+        with patch.object(ColumnMapper, 'detect_column_type') as mock_detect:
+            second = ColumnMapper.create_column_mapping(sample_instagram_df.head(1))
+        
+        mock_detect.assert_not_called()
+        assert second == first
+    
+    def test_convert_columns_reports_failures(self):
+        """Conversions leave the input untouched and count unconvertible values"""
+        df = pd.DataFrame({
+            'Gênero': ['Masculino', 'F', 'X', None],
+            'Gympass': ['Sim', 'não', 'talvez', 'true'],
+            'Curtidas': ['10', 'dez', None, '3']
+        })
+        mapping = ColumnMapper.create_column_mapping(df)
+        
+        transformed_df, failures = ColumnMapper.convert_columns(df, mapping)
+        
+        assert list(transformed_df['Gênero']) == ['M', 'F', 'F', 'F']
+        assert list(transformed_df['Gympass']) == [True, False, False, True]
+        assert list(transformed_df['Curtidas']) == [10, 0, 0, 3]
+        assert failures == {'Gênero': 1, 'Gympass': 1, 'Curtidas': 1}
+        assert list(df['Gympass']) == ['Sim', 'não', 'talvez', 'true']
+    
+    def test_transform_dataframe_inplace(self):
+        """In-place transforms convert the given frame without a copy"""
+        df = pd.DataFrame({'Plano Ativo': ['True', 'False'], 'Endereço': ['Rua A', 'Rua B']})
+        
+        result = ColumnMapper.transform_dataframe(df, {'Plano Ativo': 'active_plan'}, inplace=True)
+        
+        assert result is df
+        assert df['Plano Ativo'].dtype == bool
+    
+    @pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.csv.zst'])
+    def test_read_chunks_compressed(self, tmp_path, suffix):
+        """Compressed exports are read chunk by chunk with one mapping"""
+        path = tmp_path / f'posts{suffix}'
+        pd.DataFrame({'Data': ['2024-01-01'] * 5, 'Likes': ['1', '2', 'x', '4', '5']}).to_csv(path, index=False)
+        
+        chunks = list(ColumnMapper.read_chunks(str(path), chunk_size=2))
+        
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert list(pd.concat(chunks)['Likes']) == [1, 2, 0, 4, 5]
 
 
 class TestAnalyticsModels:
@@ -0,0 +1,68 @@
+"""
+Unit Tests for the Quarantine Sink
+=================================
+
+Test cases for bulk quarantine of rows rejected by the columnar transforms.
+"""
+
+import json
+import pandas as pd
+from src.etl.columnar import transform_students_frame
+from src.etl.quarantine import QuarantineSink
+from src.etl.sources import tag_origin
+
+
+def _raw_students(genders):
+    return pd.DataFrame({
+        'ID': list(range(1, len(genders) + 1)),
+        'Nome': ['Ana'] * len(genders),
+        'Gênero': genders,
+        'Data de Nascimento': ['1990-01-01'] * len(genders),
+        'Endereço': ['Rua A'] * len(genders),
+        'Bairro': ['Cabral'] * len(genders),
+        'Tipo_Plano': ['Mensal'] * len(genders),
+        'Gympass': ['True'] * len(genders),
+        'Valor_Plano_Mensal (R$)': [99.9] * len(genders),
+        'Valor_Plano_Total (R$)': [99.9] * len(genders),
+        'Data Início Plano': ['2024-01-01'] * len(genders),
+        'Plano Ativo': ['True'] * len(genders)
+    })
+
+
+class TestQuarantineSink:
+    """Test cases for QuarantineSink"""
+    
+    def test_rejected_rows_are_appended_across_chunks(self, tmp_path):
+        """Each chunk appends its rejected rows with file, line and error category"""
+        sink = QuarantineSink(str(tmp_path / 'rejected.csv'))
+        raw = tag_origin(_raw_students(['F', 'X', 'M', 'Y']), 'alunos.csv')
+        
+        for chunk in [raw.iloc[:2], raw.iloc[2:]]:
+            sink.write('student', chunk, transform_students_frame(chunk))
+        sink.close()
+        
+        quarantined = pd.read_csv(tmp_path / 'rejected.csv')
+        assert list(quarantined['line']) == [3, 5]
+        assert list(quarantined['source_file']) == ['alunos.csv', 'alunos.csv']
+        assert list(quarantined['error_category']) == ['gender', 'gender']
+        assert json.loads(quarantined['raw_row'][1])['Gênero'] == 'Y'
+        assert sink.summary()['rejected_by_error'] == {'student: gender': 2}
+    
+    def test_parquet_format(self, tmp_path):
+        """Parquet quarantines are written through one appending writer"""
+        sink = QuarantineSink(str(tmp_path / 'rejected.parquet'), 'parquet')
+        for genders in [['X'], ['F', 'Z']]:
+            raw = _raw_students(genders)
+            sink.write('student', raw, transform_students_frame(raw))
+        sink.close()
+        
+        assert len(pd.read_parquet(tmp_path / 'rejected.parquet')) == 2
+        assert sink.summary()['rejected_rows'] == {'student': 2}
+    
+    def test_nothing_rejected_creates_no_file(self, tmp_path):
+        """The quarantine file only exists once a row was rejected"""
+        sink = QuarantineSink(str(tmp_path / 'rejected.csv'))
+        raw = _raw_students(['F'])
+        
+        assert sink.write('student', raw, transform_students_frame(raw)) == 0
+        assert sink.summary()['quarantine_path'] is None
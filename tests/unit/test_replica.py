@@ -0,0 +1,50 @@
+"""
+Unit Tests for the Local Table Replica
+=====================================
+
+Test cases for watermarks and delta merges of the Parquet replicas.
+"""
+
+import pandas as pd
+from src.database.replica import TableReplica
+
+
+def _posts(ids, hashtags, created):
+    return pd.DataFrame({
+        'id': ids,
+        'main_hashtag': pd.Categorical(hashtags),
+        'created_at': pd.to_datetime(created)
+    })
+
+
+class TestTableReplica:
+    """Test cases for TableReplica"""
+    
+    def test_empty_replica_has_no_watermarks(self, tmp_path):
+        """A missing replica file means a full read"""
+        replica = TableReplica(str(tmp_path / 'posts.parquet'), ['id', 'created_at'])
+        
+        assert not replica.exists()
+        assert replica.watermarks() == {}
+        assert replica.load().empty
+    
+    def test_merge_replaces_updated_rows_and_persists(self, tmp_path):
+        """Fetched rows replace local rows by id and the result survives a reload"""
+        path = str(tmp_path / 'posts.parquet')
+        replica = TableReplica(path, ['id', 'created_at'])
+        replica.merge(_posts([1, 2], ['#a', '#b'], ['2024-01-01 10:00', '2024-01-02 10:00']))
+        
+        replica.merge(_posts([3, 2], ['#c', '#z'], ['2024-01-03 10:00', '2024-01-02 10:00']))
+        
+        reloaded = TableReplica(path, ['id', 'created_at'])
+        assert reloaded.load()['id'].tolist() == [1, 2, 3]
+        assert reloaded.load()['main_hashtag'].tolist() == ['#a', '#z', '#c']
+        assert isinstance(reloaded.load()['main_hashtag'].dtype, pd.CategoricalDtype)
+        assert reloaded.watermarks() == {'id': 3, 'created_at': pd.Timestamp('2024-01-03 10:00')}
+    
+    def test_projected_load(self, tmp_path):
+        """Reads can select a subset of the replicated columns"""
+        replica = TableReplica(str(tmp_path / 'posts.parquet'), ['id'])
+        replica.merge(_posts([1], ['#a'], ['2024-01-01']))
+        
+        assert replica.load(['id']).columns.tolist() == ['id']
@@ -0,0 +1,97 @@
+"""
+Unit Tests for Multi-file Sources
+=================================
+
+Test cases for partitioned input discovery, parallel reads and the ingest ledger.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from src.etl.sources import IngestLedger, align_categoricals, read_many, resolve_source_files
+
+
+def _write_csv(path, hashtags):
+    pd.DataFrame({'Data': ['2024-01-01'] * len(hashtags), 'Hashtag Principal': hashtags}).to_csv(path, index=False)
+
+
+class TestResolveSourceFiles:
+    """Test cases for resolve_source_files"""
+    
+    def test_plain_file_name(self, tmp_path):
+        """A plain file name resolves to itself, even before it exists"""
+        assert resolve_source_files(str(tmp_path), 'posts.csv') == [os.path.join(str(tmp_path), 'posts.csv')]
+    
+    def test_glob_pattern(self, tmp_path):
+        """A glob matches the monthly exports in order"""
+        for month in ['02', '01']:
+            _write_csv(tmp_path / f'posts_2024-{month}.csv', ['#a'])
+        _write_csv(tmp_path / 'other.csv', ['#a'])
+        
+        files = resolve_source_files(str(tmp_path), 'posts_*.csv')
+        
+        assert [os.path.basename(path) for path in files] == ['posts_2024-01.csv', 'posts_2024-02.csv']
+    
+    def test_partition_directory(self, tmp_path):
+        """A directory resolves to every CSV in its partitions"""
+        for month in ['2024-01', '2024-02']:
+            (tmp_path / 'posts' / month).mkdir(parents=True)
+            _write_csv(tmp_path / 'posts' / month / 'part.csv', ['#a'])
+        
+        assert len(resolve_source_files(str(tmp_path), 'posts')) == 2
+
+
+class TestReadMany:
+    """Test cases for parallel multi-file reads"""
+    
+    def test_concatenates_in_order_with_shared_categories(self, tmp_path):
+        """Categoricals with different dictionaries stay categorical after concatenation"""
+        _write_csv(tmp_path / 'a.csv', ['#fitness', '#gym'])
+        _write_csv(tmp_path / 'b.csv', ['#workout'])
+        paths = [str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')]
+        
+        df = read_many(paths, lambda path: pd.read_csv(path, dtype={'Hashtag Principal': 'category'}), workers=2)
+        
+        assert list(df['Hashtag Principal']) == ['#fitness', '#gym', '#workout']
+        assert isinstance(df['Hashtag Principal'].dtype, pd.CategoricalDtype)
+    
+    def test_align_categoricals_unions_dictionaries(self):
+        """Every frame gets the union of the category dictionaries"""
+        frames = align_categoricals([
+            pd.DataFrame({'tag': pd.Categorical(['a'])}),
+            pd.DataFrame({'tag': pd.Categorical(['b'])})
+        ])
+        
+        assert list(frames[0]['tag'].cat.categories) == list(frames[1]['tag'].cat.categories) == ['a', 'b']
+
+
+class TestIngestLedger:
+    """Test cases for IngestLedger"""
+    
+    def test_only_new_or_changed_files_are_pending(self, tmp_path):
+        """Marked files are skipped until they change"""
+        old, new = tmp_path / 'old.csv', tmp_path / 'new.csv'
+        _write_csv(old, ['#a'])
+        _write_csv(new, ['#b'])
+        ledger_path = str(tmp_path / 'ledger.json')
+        IngestLedger(ledger_path).mark([str(old)])
+        
+        ledger = IngestLedger(ledger_path)
+        assert ledger.pending([str(old), str(new)]) == [str(new)]
+        
+        _write_csv(old, ['#a', '#c'])
+        assert ledger.pending([str(old)]) == [str(old)]
+    
+    def test_concurrent_marks_are_all_persisted(self, tmp_path):
+        """Branches marking files at the same time do not lose each other's updates"""
+        paths = []
+        for number in range(16):
+            _write_csv(tmp_path / f'{number}.csv', ['#a'])
+            paths.append(str(tmp_path / f'{number}.csv'))
+        ledger_path = str(tmp_path / 'ledger.json')
+        ledger = IngestLedger(ledger_path)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda path: ledger.mark([path]), paths))
+        
+        assert IngestLedger(ledger_path).pending(paths) == []
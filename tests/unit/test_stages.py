@@ -0,0 +1,58 @@
+"""
+Unit Tests for Pipeline Stages
+=============================
+
+Test cases for the bounded prefetch stages of the streaming pipeline.
+"""
+
+import threading
+import time
+import pytest
+from src.etl.stages import prefetch
+
+
+class TestPrefetch:
+    """Test cases for prefetch"""
+    
+    def test_items_keep_their_order(self):
+        """Chained stages yield every item in order"""
+        doubled = prefetch((item * 2 for item in prefetch(range(100), depth=3)), depth=2)
+        
+        assert list(doubled) == [item * 2 for item in range(100)]
+    
+    def test_producer_is_throttled_by_consumer(self):
+        """The producer never runs more than the buffer depth ahead"""
+        produced = []
+        
+        def items():
+            for item in range(50):
+                produced.append(item)
+                yield item
+        
+        stage = prefetch(items(), depth=2)
+        assert next(stage) == 0
+        time.sleep(0.2)
+        
+        # one item consumed, two buffered and one waiting to be put
+        assert len(produced) <= 4
+        stage.close()
+    
+    def test_producer_error_reaches_consumer(self):
+        """Errors raised while producing are re-raised in the consumer"""
+        def items():
+            yield 1
+            raise ValueError("bad chunk")
+        
+        stage = prefetch(items(), depth=2)
+        
+        assert next(stage) == 1
+        with pytest.raises(ValueError, match="bad chunk"):
+            next(stage)
+    
+    def test_closing_stops_the_producer(self):
+        """Closing the consumer side ends the producer thread"""
+        stage = prefetch(iter(range(10**6)), depth=1, name="prefetch-close-test")
+        next(stage)
+        stage.close()
+        
+        assert not any(thread.name == "prefetch-close-test" for thread in threading.enumerate())